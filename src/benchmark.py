@@ -0,0 +1,46 @@
+import argparse
+import main
+from etl.common.memory_audit import ALLOCATION_REPORT, audit_allocations, enable_copy_on_write, format_bytes
+
+# Stage name -> runner, in pipeline order
+BENCHMARK_STAGES = {
+    'assessment': main.run_assessment_cleaner,
+    'code_violations': main.run_code_violations_cleaner,
+    'violations': main.run_violations_cleaner,
+    'housing_court_cases': main.run_housing_court_case_cleaner,
+    'local_assessment': main.run_local_assessment_cleaner,
+    'bank': main.run_bank_data_cleaning,
+}
+
+
+def run_allocation_audit(stages=None, copy_on_write=True):
+    """
+    Runs pipeline stages one after another and reports the memory each one allocates.
+
+    Parameters:
+    - stages (list): Stage names to run; all of BENCHMARK_STAGES when None.
+    - copy_on_write (bool): Run the cleaners under pandas copy-on-write, or with pandas' default copies.
+
+    Returns:
+    - list: One entry per stage with 'stage', 'seconds', 'peak_bytes' and 'retained_bytes'.
+    """
+    enable_copy_on_write(copy_on_write)
+    del ALLOCATION_REPORT[:]
+    for name in stages or BENCHMARK_STAGES:
+        with audit_allocations(name):
+            BENCHMARK_STAGES[name]()
+
+    print(f"\n{'Stage':<22}{'Seconds':>10}{'Peak':>14}{'Retained':>14}")
+    for entry in ALLOCATION_REPORT:
+        print(f"{entry['stage']:<22}{entry['seconds']:>10}"
+              f"{format_bytes(entry['peak_bytes']):>14}{format_bytes(entry['retained_bytes']):>14}")
+    return list(ALLOCATION_REPORT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the bytes each pipeline stage allocates.")
+    parser.add_argument('--stage', action='append', choices=list(BENCHMARK_STAGES), dest='stages',
+                        help="Stage to run; repeat for several (default: all).")
+    parser.add_argument('--no-copy-on-write', action='store_true', help="Run with pandas' default copying behavior.")
+    args = parser.parse_args()
+    run_allocation_audit(args.stages, copy_on_write=not args.no_copy_on_write)
@@ -0,0 +1 @@
+# Makes the etl package importable when pytest is run from the repository root.
@@ -1,5 +1,10 @@
 import csv
 import re
+import pandas as pd
+from etl.common.batch_ingest import run_stage
+from etl.common.compressed_io import open_text, output_path
+from etl.common.config import check_backend, raw_path, stage_path
+from etl.common.data_profiler import DATA_PROFILING, profile_frame
 
 def transform_header(header):
     """
@@ -25,16 +30,21 @@ def transform_header(header):
     transformed = re.sub(r'_+', '_', transformed)  # Replace multiple underscores with one
     return transformed.title()
 
-def modify_and_export_csv_headers(input_filepath, output_filepath):
+def modify_and_export_csv_headers(input_filepath, output_filepath, backend='pandas'):
     """
     Reads headers from a CSV, applies transformation to specified headers, and exports to a new CSV file.
     - Ignores the first column and last four columns for transformation.
+    - Gzip/zstd compressed files are read and written transparently based on their extension.
 
     Parameters:
     - input_filepath (str): Path to the input CSV file.
     - output_filepath (str): Path to the output CSV file.
     """
-    with open(input_filepath, mode='r', newline='') as file:
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_assessment_headers(input_filepath, output_filepath)
+    with open_text(input_filepath, mode='r') as file:
         reader = csv.reader(file)
         headers = next(reader)
         data_rows = list(reader)
@@ -43,18 +53,23 @@ def modify_and_export_csv_headers(input_filepath, output_filepath):
         headers_to_modify = headers[1:-4]
         transformed_headers = [headers[0]] + [transform_header(header) for header in headers_to_modify] + headers[-4:]
 
-    with open(output_filepath, mode='w', newline='') as file:
+    with open_text(output_filepath, mode='w') as file:
         writer = csv.writer(file)
         writer.writerow(transformed_headers)
         writer.writerows(data_rows)
+    # Profile the rows already in memory, as the text written out; empty cells count as nulls
+    if DATA_PROFILING:
+        rows = pd.DataFrame(data_rows, columns=transformed_headers, dtype=object)
+        profile_frame(rows.where(rows != ''), output_filepath)
     print(f"Headers transformed and saved to {output_filepath}")
 
 # Exported function for main file usage
-def process_csv_headers():
+def process_csv_headers(backend='pandas'):
     """
     Wrapper function to process CSV headers, intended for use in main scripts.
+    The input may also be a directory or multi-file drop (see `batch_ingest.run_stage`).
     """
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Assessment.csv'  # Replace with your actual input file path
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/stage/Assessment_header.csv'  # Replace with your desired output file path
-    modify_and_export_csv_headers(input_filepath, output_filepath)
+    input_filepath = raw_path('Assessment.csv')
+    output_filepath = output_path(stage_path('Assessment_header.csv'))
+    run_stage(modify_and_export_csv_headers, input_filepath, output_filepath, backend=backend)
     print("Data Assessment header cleaning completed successfully.")
@@ -1,4 +1,7 @@
 import pandas as pd
+from etl.common.data_profiler import profile_frame
+from etl.common.compressed_io import input_path, output_path, remove_other_variants
+from etl.common.config import check_backend, raw_path, stage_path, prod_path
 
 def add_historic_district_column(assessment_df, historic_keys_df):
     """
@@ -21,7 +24,7 @@ def add_historic_district_column(assessment_df, historic_keys_df):
     print(assessment_df)
     return assessment_df
 
-def load_and_process_assessment_data(assessment_filepath, historic_keys_filepath, output_filepath):
+def load_and_process_assessment_data(assessment_filepath, historic_keys_filepath, output_filepath, backend='pandas'):
     """
     Loads, processes, and saves assessment data with historic district information.
 
@@ -33,6 +36,10 @@ def load_and_process_assessment_data(assessment_filepath, historic_keys_filepath
     Returns:
     - pd.DataFrame: Final DataFrame with 'Historic_District_Name' column added, saved to output file.
     """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_assessment_district_names(assessment_filepath, historic_keys_filepath, output_filepath)
     # Load data
     print("Loading assessment data...")
     assessment_df = pd.read_csv(assessment_filepath, low_memory=False)
@@ -50,22 +57,23 @@ def load_and_process_assessment_data(assessment_filepath, historic_keys_filepath
 
     # Save updated assessment data
     print("Saving updated assessment data to:", output_filepath)
+    profile_frame(assessment_df, output_filepath)
     assessment_df.to_csv(output_filepath, index=False)
 
     return assessment_df
 
 # Example function for use in a main script
-def run_assessment_data_cleaning():
+def run_assessment_data_cleaning(backend='pandas'):
     """
     Main function to execute the assessment data cleaning process, 
     matching historic district data and saving the final output.
     """
-    # Replace with your actual file paths
-    assessment_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/stage/Assessment_is_Historic.csv'
-    historic_keys_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Historic_Districts_Print_Keys.csv'
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Assessment.csv'
+    assessment_filepath = output_path(stage_path('Assessment_is_Historic.csv'))
+    historic_keys_filepath = input_path(raw_path('Historic_Districts_Print_Keys.csv'))
+    output_filepath = output_path(prod_path('Assessment.csv'))
 
     # Run the processing
     print("Starting the assessment data cleaning process...")
-    load_and_process_assessment_data(assessment_filepath, historic_keys_filepath, output_filepath)
+    load_and_process_assessment_data(assessment_filepath, historic_keys_filepath, output_filepath, backend=backend)
+    remove_other_variants(output_filepath)
     print("Final Assessment data exported with Historic_District_Name!")
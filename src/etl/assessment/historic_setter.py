@@ -1,4 +1,7 @@
 import pandas as pd
+from etl.common.data_profiler import profile_frame
+from etl.common.compressed_io import input_path, output_path, remove_other_variants
+from etl.common.config import check_backend, raw_path, stage_path
 
 def add_historic_property_column(assessment_df, parcel_df):
     """
@@ -26,7 +29,7 @@ def filter_historic_properties(assessment_df):
     """
     return assessment_df[assessment_df['Historic_Property'] == 1]
 
-def load_and_process_assessment_data(assessment_filepath, parcel_filepath, output_filepath):
+def load_and_process_assessment_data(assessment_filepath, parcel_filepath, output_filepath, backend='pandas'):
     """
     Loads, processes, and saves assessment data with historic property information.
 
@@ -38,6 +41,10 @@ def load_and_process_assessment_data(assessment_filepath, parcel_filepath, outpu
     Returns:
     - pd.DataFrame: Final DataFrame with 'Historic_Property' column added, saved to output file.
     """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_assessment_historic(assessment_filepath, parcel_filepath, output_filepath)
     # Load data
     assessment_df = pd.read_csv(assessment_filepath, low_memory=False)
     parcel_df = pd.read_csv(parcel_filepath, low_memory=False)
@@ -50,15 +57,17 @@ def load_and_process_assessment_data(assessment_filepath, parcel_filepath, outpu
     print(filter_historic_properties(assessment_df).head())
 
     # Save updated assessment data
+    profile_frame(assessment_df, output_filepath)
     assessment_df.to_csv(output_filepath, index=False)
     print("Updated assessment data saved to:", output_filepath)
 
     return assessment_df
 
 # Example function for use in a main script
-def run_assessment_data_cleaning():
-    assessment_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/stage/Assessment_cleaned.csv'  # Replace with your actual assessment file path
-    parcel_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/All_Historic_Parcels.csv'  # Replace with your actual parcel file path
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/stage/Assessment_is_Historic.csv'  # Replace with your desired output file path
-    load_and_process_assessment_data(assessment_filepath, parcel_filepath, output_filepath)
+def run_assessment_data_cleaning(backend='pandas'):
+    assessment_filepath = output_path(stage_path('Assessment_cleaned.csv'))
+    parcel_filepath = input_path(raw_path('All_Historic_Parcels.csv'))
+    output_filepath = output_path(stage_path('Assessment_is_Historic.csv'))
+    load_and_process_assessment_data(assessment_filepath, parcel_filepath, output_filepath, backend=backend)
+    remove_other_variants(output_filepath)
     print("Final Assessment exported!")
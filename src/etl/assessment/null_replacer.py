@@ -1,38 +1,48 @@
 import pandas as pd
+from etl.common.data_profiler import profile_frame
+from etl.common.compressed_io import output_path, remove_other_variants
+from etl.common.config import check_backend, stage_path
 
 def load_csv(filepath):
     """Load CSV file with low memory mode disabled."""
     return pd.read_csv(filepath, low_memory=False)
 
 def replace_nulls(df):
-    """Replace NULLs in string fields with 'UNKNOWN' and in numeric fields with -1."""
-    for column in df.columns:
-        if pd.api.types.is_numeric_dtype(df[column]):
-            df[column].fillna(-1, inplace=True)
-        elif pd.api.types.is_string_dtype(df[column]):
-            df[column].fillna("UNKNOWN", inplace=True)
-    return df
+    """
+    Replace NULLs in string fields with 'UNKNOWN' and in numeric fields with -1.
+
+    Only columns of pandas' string dtype count as string fields. An object column with
+    missing values is not one (`is_string_dtype` is False for it), so its blanks are kept.
+    """
+    numeric_columns = df.select_dtypes(include='number').columns
+    text_columns = df.select_dtypes(include='string').columns
+    fill_values = {**{col: -1 for col in numeric_columns}, **{col: "UNKNOWN" for col in text_columns}}
+    return df.fillna(fill_values)
 
 def standardize_dates(df, filler_date="9999-12-31"):
     """Standardize date columns to 'YYYY-MM-DD' and replace NULL dates with a default filler date."""
     for column in df.columns:
         if 'date' in column.lower():
-            df[column] = pd.to_datetime(df[column], errors='coerce').dt.strftime("%Y-%m-%d")
-            df[column].fillna(filler_date, inplace=True)
+            df[column] = pd.to_datetime(df[column], errors='coerce').dt.strftime("%Y-%m-%d").fillna(filler_date)
     return df
 
 def save_csv(df, filepath):
     """Save DataFrame to a CSV file."""
+    profile_frame(df, filepath)
     df.to_csv(filepath, index=False)
     print(f"Data cleaning complete. Output saved to {filepath}")
 
-def clean_csv_data(input_filepath, output_filepath):
+def clean_csv_data(input_filepath, output_filepath, backend='pandas'):
     """
     Main function to clean CSV data:
     - Replaces NULLs in string fields with 'UNKNOWN' and in numeric fields with -1
     - Standardizes date formats and replaces NULL dates with '9999-12-31'
     - Saves the cleaned data to the specified output file
     """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_assessment_nulls(input_filepath, output_filepath)
     # Load data
     df = load_csv(input_filepath)
 
@@ -44,8 +54,9 @@ def clean_csv_data(input_filepath, output_filepath):
     save_csv(df, output_filepath)
 
 # Example function for use in a main script
-def run_csv_data_cleaning():
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/stage/Assessment_header.csv'  # Replace with your actual input file path
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/stage/Assessment_cleaned.csv'  # Replace with your desired output file path
-    clean_csv_data(input_filepath, output_filepath)
+def run_csv_data_cleaning(backend='pandas'):
+    input_filepath = output_path(stage_path('Assessment_header.csv'))
+    output_filepath = output_path(stage_path('Assessment_cleaned.csv'))
+    clean_csv_data(input_filepath, output_filepath, backend=backend)
+    remove_other_variants(output_filepath)
     print("Data Assessment null cleaning completed successfully.")
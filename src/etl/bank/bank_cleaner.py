@@ -1,4 +1,8 @@
 import pandas as pd
+from etl.common.data_profiler import profile_frame
+from etl.common.batch_ingest import run_stage
+from etl.common.compressed_io import output_path
+from etl.common.config import check_backend, raw_path, prod_path
 
 def capitalize_headers(data):
     """
@@ -30,19 +34,25 @@ def merge_notes_columns(data):
     data = data[['BANK_CODE', 'BANK_NAME']]
     return data
 
-def load_and_process_data(input_filepath, output_filepath):
+def load_and_process_data(input_filepath, output_filepath, backend='pandas', dtype=None):
     """
     Loads data, processes headers and notes columns, and saves the cleaned data.
 
     Parameters:
     - input_filepath (str): Path to the input file.
     - output_filepath (str): Path to save the output file.
+    - backend (str): 'pandas' or 'polars'.
+    - dtype (dict): Column types to read, e.g. the common types of a multi-file drop.
 
     Returns:
     - pd.DataFrame: Final cleaned DataFrame saved to the output file.
     """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_bank_codes(input_filepath, output_filepath, dtype)
     # Load the data
-    data = pd.read_csv(input_filepath)
+    data = pd.read_csv(input_filepath, dtype=dtype)
 
     # Process headers
     data = capitalize_headers(data)
@@ -51,6 +61,7 @@ def load_and_process_data(input_filepath, output_filepath):
     data = merge_notes_columns(data)
 
     # Save the cleaned data
+    profile_frame(data, output_filepath)
     data.to_csv(output_filepath, index=False)
     print(f"Data cleaned and saved to {output_filepath}")
 
@@ -58,8 +69,8 @@ def load_and_process_data(input_filepath, output_filepath):
 
 
 # Example function for use in a main script
-def run_bank_data_cleaning():
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Bank_Code_Identifier.csv'  # Replace with your actual file path
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Bank_Code_Identifier.csv'  # Replace with your desired output file path
-    load_and_process_data(input_filepath, output_filepath)
+def run_bank_data_cleaning(backend='pandas'):
+    input_filepath = raw_path('Bank_Code_Identifier.csv')
+    output_filepath = output_path(prod_path('Bank_Code_Identifier.csv'))
+    run_stage(load_and_process_data, input_filepath, output_filepath, backend=backend)
     print("Bank Codes Data cleaning completed!")
\ No newline at end of file
@@ -2,6 +2,10 @@ import pandas as pd
 import re
 from bs4 import BeautifulSoup
 import html
+from etl.common.data_profiler import profile_frame
+from etl.common.batch_ingest import run_stage
+from etl.common.compressed_io import output_path
+from etl.common.config import check_backend, raw_path, prod_path
 
 def clean_text(text):
     """
@@ -37,11 +41,11 @@ def handle_null_values(df, columns):
     - df (DataFrame): The DataFrame to modify.
     - columns (list): List of columns to check for NULL values.
     """
-    for column in columns:
-        null_count = df[column].isnull().sum()
-        if null_count > 0:
-            df[column] = df[column].fillna('UNKNOWN')
-            print(f"Replaced {null_count} NULL values in '{column}' column with 'UNKNOWN'")
+    null_counts = df[columns].isnull().sum()
+    null_counts = null_counts[null_counts > 0]
+    df[null_counts.index] = df[null_counts.index].fillna('UNKNOWN')
+    for column, null_count in null_counts.items():
+        print(f"Replaced {null_count} NULL values in '{column}' column with 'UNKNOWN'")
 
 def select_columns(df, end_column_name):
     """
@@ -118,7 +122,7 @@ def fill_empty_values(df, column_name, fill_value):
         df[column_name] = df[column_name].fillna(fill_value)
     return df
 
-def process_code_violations(input_filepath, output_filepath):
+def process_code_violations(input_filepath, output_filepath, backend='pandas', dtype=None):
     """
     Main function to process code violations data by:
     - Handling NULL values in specified columns.
@@ -132,8 +136,14 @@ def process_code_violations(input_filepath, output_filepath):
     Parameters:
     - input_filepath (str): Path to the input CSV file.
     - output_filepath (str): Path to the output CSV file.
+    - backend (str): 'pandas' or 'polars'.
+    - dtype (dict): Column types to read, e.g. the common types of a multi-file drop.
     """
-    df = pd.read_csv(input_filepath, low_memory=False)
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_code_violations(input_filepath, output_filepath, dtype)
+    df = pd.read_csv(input_filepath, low_memory=False, dtype=dtype)
     
     handle_null_values(df, ['SBL', 'Address'])
     df = select_columns(df, 'Address')
@@ -146,12 +156,13 @@ def process_code_violations(input_filepath, output_filepath):
     if 'Comments' in df.columns:
         df['Comments'] = df['Comments'].apply(clean_text)
     
+    profile_frame(df, output_filepath)
     df.to_csv(output_filepath, index=False)
     print(f"Cleaning complete. Results saved to '{output_filepath}'")
 
 # Example function for use in a main script
-def run_code_violations_cleaning():
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Code_Violations.csv'
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Code_Violations.csv'
-    process_code_violations(input_filepath, output_filepath)
+def run_code_violations_cleaning(backend='pandas'):
+    input_filepath = raw_path('Code_Violations.csv')
+    output_filepath = output_path(prod_path('Code_Violations.csv'))
+    run_stage(process_code_violations, input_filepath, output_filepath, backend=backend)
     print("Code violations data cleaning completed successfully.")
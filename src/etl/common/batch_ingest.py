@@ -0,0 +1,191 @@
+import glob
+import inspect
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from etl.common.compressed_io import input_path, open_text, remove_other_variants, strip_compression_suffix
+from etl.common.data_profiler import keep_state, merge_profiles
+from etl.common.memory_audit import copy_on_write_enabled, enable_copy_on_write
+
+MAX_WORKERS = int(os.getenv('INGEST_WORKERS', '0')) or None
+
+_CSV_PATTERNS = ('*.csv', '*.csv.gz', '*.csv.zst')
+
+
+class SchemaDriftError(ValueError):
+    """Raised when the files of a multi-file drop do not share the same columns."""
+
+
+def expand_inputs(input_spec):
+    """
+    Expands an input specification into the list of files to ingest.
+
+    Parameters:
+    - input_spec (str): A single file, a directory of CSV files, or a glob such as 'raw/Code_Violations_*.csv'.
+      A plain '.../Name.csv' path that does not exist also matches a 'Name/' directory or 'Name_*.csv' files,
+      so monthly or per-district drops are picked up without changing the configured path.
+
+    Returns:
+    - list: Sorted file paths.
+    """
+    if glob.has_magic(input_spec):
+        return sorted(glob.glob(input_spec))
+    if os.path.isdir(input_spec):
+        return sorted(path for pattern in _CSV_PATTERNS for path in glob.glob(os.path.join(input_spec, pattern)))
+    resolved = input_path(input_spec)
+    if os.path.exists(resolved):
+        return [resolved]
+    base = os.path.splitext(strip_compression_suffix(input_spec))[0]
+    if os.path.isdir(base):
+        return expand_inputs(base)
+    matches = sorted(path for pattern in _CSV_PATTERNS for path in glob.glob(f"{base}_{pattern}"))
+    return matches or [input_spec]
+
+
+def check_schema_drift(filepaths):
+    """
+    Compares the header of every file against the first one before any cleaning starts.
+
+    Column order may differ between files; missing or extra columns raise.
+
+    Parameters:
+    - filepaths (list): Files of one drop.
+
+    Returns:
+    - list: The reference column names (from the first file).
+    """
+    reference = list(pd.read_csv(filepaths[0], nrows=0).columns)
+    problems = []
+    for filepath in filepaths[1:]:
+        columns = list(pd.read_csv(filepath, nrows=0).columns)
+        missing = sorted(set(reference) - set(columns))
+        extra = sorted(set(columns) - set(reference))
+        if missing or extra:
+            problems.append(f"{filepath}: missing {missing}, extra {extra}")
+    if problems:
+        raise SchemaDriftError(f"Schema drift against {filepaths[0]}:\n" + "\n".join(problems))
+    return reference
+
+
+def read_dtypes(filepath, backend='pandas'):
+    """Returns the column types a backend infers over a whole file as pandas dtype names, e.g. {'Description': 'float64'}."""
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.read_dtypes(filepath)
+    return {name: str(dtype) for name, dtype in pd.read_csv(filepath, low_memory=False).dtypes.items()}
+
+
+def common_dtypes(file_dtypes):
+    """
+    Merges the column types inferred for each file of a drop into the types pandas would infer for
+    the files concatenated, so every file is cleaned as if it were part of one file. A column that is
+    empty (float64) in one file but text in another is read as text everywhere, and an integer
+    column with gaps in one file is read as float64 everywhere.
+
+    Parameters:
+    - file_dtypes (list): One `read_dtypes` result per file.
+
+    Returns:
+    - dict: dtype per column whose types differ between files; other columns are left to inference.
+    """
+    dtype = {}
+    for name in file_dtypes[0]:
+        kinds = {dtypes[name] for dtypes in file_dtypes}
+        if len(kinds) > 1:
+            dtype[name] = 'float64' if kinds <= {'int64', 'float64'} else 'object'
+    return dtype
+
+
+def partition_dir(output_filepath):
+    """Returns the folder partitions of an output are written to, e.g. 'prod/Code_Violations.parts'."""
+    return os.path.splitext(strip_compression_suffix(output_filepath))[0] + '.parts'
+
+
+def combine_partitions(partition_paths, output_filepath):
+    """
+    Concatenates partition CSVs into one output file, keeping the first header only.
+    Partitions are copied as text without being parsed again, unless their columns are in a
+    different order than the first partition's, in which case they are re-read and reordered.
+    """
+    first_header = None
+    with open_text(output_filepath, mode='w') as output:
+        for partition in partition_paths:
+            with open_text(partition, mode='r') as file:
+                header = file.readline()
+                if first_header is None:
+                    first_header = header
+                    columns = list(pd.read_csv(partition, nrows=0).columns)
+                    output.write(header)
+                elif header != first_header:
+                    pd.read_csv(partition, low_memory=False)[columns].to_csv(output, header=False, index=False)
+                    continue
+                shutil.copyfileobj(file, output)
+    print(f"Combined {len(partition_paths)} partitions into {output_filepath}")
+
+
+def _start_worker(copy_on_write):
+    """Worker process setup: the parent's copy-on-write setting, and profiles kept mergeable."""
+    enable_copy_on_write(copy_on_write)
+    keep_state()
+
+
+def run_stage(process, input_spec, output_filepath, *extra_inputs, combine=True, max_workers=MAX_WORKERS, **kwargs):
+    """
+    Runs a cleaner's `process_*` function over a single file or a multi-file drop. Other compression
+    variants of a combined output (e.g. an old plain 'X.csv' next to the new 'X.csv.gz') are removed.
+
+    A single file is processed directly. Several files are checked for schema drift, cleaned
+    concurrently on a process pool (one partition per file) and then either combined into
+    `output_filepath` or left as partitions in `partition_dir(output_filepath)`. When `process`
+    takes a `dtype` argument, the workers first infer each file's column types and every file is
+    then read with the `common_dtypes` of the drop, so the combined output matches cleaning the
+    files concatenated into one.
+
+    Parameters:
+    - process (callable): Called as `process(input_file, *extra_inputs, output_file, **kwargs)`.
+    - input_spec (str): File, directory or glob of input files (see `expand_inputs`).
+    - output_filepath (str): Where the stage output is written.
+    - extra_inputs (str): Additional inputs passed to every call, e.g. a lookup file.
+    - combine (bool): Combine partitions into one output file, or keep them as partitions.
+    - max_workers (int): Worker processes; defaults to INGEST_WORKERS or the CPU count.
+    - kwargs: Extra keyword arguments for `process`, e.g. `backend`.
+
+    Returns:
+    - list: The output file, or the partition files when `combine` is False.
+    """
+    filepaths = expand_inputs(input_spec)
+    if len(filepaths) == 1:
+        process(filepaths[0], *extra_inputs, output_filepath, **kwargs)
+        remove_other_variants(output_filepath)
+        return [output_filepath]
+
+    check_schema_drift(filepaths)
+    parts = partition_dir(output_filepath)
+    os.makedirs(parts, exist_ok=True)
+    # Partitions keep the output's compression only when they are the final result
+    extension = output_filepath[len(strip_compression_suffix(output_filepath)):] if not combine else ''
+    partition_paths = [os.path.join(parts, f"part-{index:05d}.csv{extension}") for index in range(len(filepaths))]
+
+    print(f"Cleaning {len(filepaths)} files from {input_spec} on up to {max_workers or os.cpu_count()} workers...")
+    # Workers clean under the same copy-on-write setting as the parent process
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_start_worker,
+                             initargs=(copy_on_write_enabled(),)) as executor:
+        if 'dtype' in inspect.signature(process).parameters:
+            backends = [kwargs.get('backend', 'pandas')] * len(filepaths)
+            kwargs['dtype'] = common_dtypes(list(executor.map(read_dtypes, filepaths, backends)))
+        futures = [
+            executor.submit(process, filepath, *extra_inputs, partition, **kwargs)
+            for filepath, partition in zip(filepaths, partition_paths)
+        ]
+        for future in futures:
+            future.result()
+
+    if not combine:
+        return partition_paths
+    combine_partitions(partition_paths, output_filepath)
+    # The workers' profiles describe single partitions and go with them; their states add up to the combined one
+    merge_profiles(partition_paths, output_filepath)
+    shutil.rmtree(parts)
+    remove_other_variants(output_filepath)
+    return [output_filepath]
@@ -0,0 +1,111 @@
+import gzip
+import io
+import os
+
+# Output compression for stage and prod files: 'gzip', 'zstd' or 'none'.
+OUTPUT_COMPRESSION = os.getenv('OUTPUT_COMPRESSION', 'gzip').lower()
+
+# File extension -> (pandas compression name, Snowflake SOURCE_COMPRESSION)
+COMPRESSION_EXTENSIONS = {
+    '.gz': ('gzip', 'GZIP'),
+    '.zst': ('zstd', 'ZSTD'),
+}
+
+_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+
+def compression_for(filepath):
+    """
+    Detects the compression of a file from its extension.
+
+    Parameters:
+    - filepath (str): Path to the file.
+
+    Returns:
+    - str or None: 'gzip', 'zstd', or None for uncompressed files.
+    """
+    entry = COMPRESSION_EXTENSIONS.get(os.path.splitext(filepath)[1].lower())
+    return entry[0] if entry else None
+
+
+def source_compression_for(filepath):
+    """
+    Returns the Snowflake SOURCE_COMPRESSION value for a file, or None if it is uncompressed.
+    """
+    entry = COMPRESSION_EXTENSIONS.get(os.path.splitext(filepath)[1].lower())
+    return entry[1] if entry else None
+
+
+def strip_compression_suffix(filepath):
+    """Removes a trailing '.gz' or '.zst' extension, e.g. 'Assessment.csv.gz' -> 'Assessment.csv'."""
+    root, ext = os.path.splitext(filepath)
+    return root if ext.lower() in COMPRESSION_EXTENSIONS else filepath
+
+
+def output_path(filepath):
+    """
+    Returns the path a stage or prod file is written to, adding the OUTPUT_COMPRESSION extension.
+
+    Parameters:
+    - filepath (str): Uncompressed path, e.g. '.../prod/Assessment.csv'.
+
+    Returns:
+    - str: e.g. '.../prod/Assessment.csv.gz' when OUTPUT_COMPRESSION is 'gzip'.
+    """
+    if OUTPUT_COMPRESSION not in _SUFFIXES:
+        raise ValueError(f"Unsupported OUTPUT_COMPRESSION '{OUTPUT_COMPRESSION}'; expected one of {sorted(_SUFFIXES)}")
+    return strip_compression_suffix(filepath) + _SUFFIXES[OUTPUT_COMPRESSION]
+
+
+def _variants(filepath):
+    base = strip_compression_suffix(filepath)
+    return list(dict.fromkeys([filepath, base, base + '.gz', base + '.zst']))
+
+
+def input_path(filepath):
+    """
+    Resolves an input path to the variant that exists on disk: plain, '.gz' or '.zst'.
+
+    If several exist (e.g. an old 'Assessment.csv' next to a new 'Assessment.csv.gz'), the most
+    recently modified one is used, as the uploader does. Returns the path unchanged if no variant
+    exists, so the caller reports the usual missing-file error.
+    """
+    existing = [candidate for candidate in _variants(filepath) if os.path.exists(candidate)]
+    if not existing:
+        return filepath
+    return max(existing, key=os.path.getmtime)
+
+
+def remove_other_variants(filepath):
+    """
+    Deletes the other compression variants of a file that was just written, e.g. an old
+    'Assessment.csv' after 'Assessment.csv.gz' is written, so no reader picks up stale contents.
+    """
+    for candidate in _variants(filepath)[1:]:
+        if candidate != filepath and os.path.exists(candidate):
+            os.remove(candidate)
+            print(f"Removed {candidate}, replaced by {filepath}")
+
+
+def open_text(filepath, mode='r', newline=''):
+    """
+    Opens a text file, transparently (de)compressing it based on its extension.
+
+    Parameters:
+    - filepath (str): Path to the file.
+    - mode (str): 'r', 'w' or 'a'.
+    - newline (str): Passed to the text wrapper; '' is what the csv module expects.
+
+    Returns:
+    - A text file object.
+    """
+    compression = compression_for(filepath)
+    if compression == 'gzip':
+        return gzip.open(filepath, mode + 't', newline=newline, encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError("Reading or writing '.zst' files requires the 'zstandard' package.") from error
+        return zstandard.open(filepath, mode + 't', newline=newline, encoding='utf-8')
+    return io.open(filepath, mode, newline=newline, encoding='utf-8')
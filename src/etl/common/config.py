@@ -0,0 +1,36 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Data folders; each defaults to the matching folder under src/data
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+RAW_FILE_PATH = os.getenv('RAW_FILE_PATH', os.path.join(DATA_PATH, 'raw'))
+STAGE_FILE_PATH = os.getenv('STAGE_FILE_PATH', os.path.join(DATA_PATH, 'stage'))
+PROD_FILE_PATH = os.getenv('PROD_FILE_PATH', os.path.join(DATA_PATH, 'prod'))
+
+
+def raw_path(filename):
+    """Returns the path of a file in the raw data folder, e.g. raw_path('Code_Violations.csv')."""
+    return os.path.join(RAW_FILE_PATH, filename)
+
+
+def stage_path(filename):
+    """Returns the path of a file in the stage data folder."""
+    return os.path.join(STAGE_FILE_PATH, filename)
+
+
+def prod_path(filename):
+    """Returns the path of a file in the prod data folder."""
+    return os.path.join(PROD_FILE_PATH, filename)
+
+
+# Cleaning backends a stage can run on
+BACKENDS = ('pandas', 'polars')
+
+
+def check_backend(backend):
+    """Raises a ValueError for a backend name other than 'pandas' or 'polars'."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend '{backend}'; expected one of {list(BACKENDS)}")
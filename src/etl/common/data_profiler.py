@@ -0,0 +1,244 @@
+import json
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from etl.common.compressed_io import strip_compression_suffix
+
+# Profiles are written next to each stage output unless DATA_PROFILING is set to 'off'.
+DATA_PROFILING = os.getenv('DATA_PROFILING', 'on').lower() != 'off'
+
+# Set in the worker processes of `batch_ingest.run_stage`: partition profiles also keep their
+# mergeable state, so the combined output's profile is merged from them instead of re-read.
+KEEP_STATE = False
+
+# Placeholder values the cleaners substitute for missing data
+TEXT_SENTINELS = ['UNKNOWN', 'N/A', '-1', '9999-12-31']
+NUMERIC_SENTINEL = -1
+
+# HyperLogLog precision: 2**14 registers per column, ~0.8% standard error
+HLL_PRECISION = 14
+
+
+_TEXT_SENTINEL_HASHES = pd.util.hash_pandas_object(pd.Series(TEXT_SENTINELS, dtype=object), index=False).to_numpy()
+
+
+class HyperLogLog:
+    """Approximate distinct counter fed with 64-bit hashes in vectorized batches."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = (hashes << np.uint64(self.precision)) | np.uint64(1 << (self.precision - 1))
+        # Position of the leftmost 1-bit in the remaining bits
+        rank = (64 - np.floor(np.log2(remainder.astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class ColumnProfile:
+    """Running statistics for one column."""
+
+    def __init__(self, name):
+        self.name = name
+        self.nulls = 0
+        self.sentinels = 0
+        self.date_failures = 0
+        self.minimum = None
+        self.maximum = None
+        self.distinct = HyperLogLog()
+
+    def update(self, values, missing):
+        self.nulls += int(missing.sum())
+        present = values[~missing]
+        if present.empty:
+            return
+        hashes = pd.util.hash_pandas_object(present, index=False).to_numpy()
+        self.distinct.add_hashes(hashes)
+        numeric = pd.api.types.is_numeric_dtype(present)
+        if numeric:
+            is_sentinel = (present == NUMERIC_SENTINEL).to_numpy()
+        else:
+            # Reuse the distinct-count hashes rather than comparing strings again
+            is_sentinel = np.isin(hashes, _TEXT_SENTINEL_HASHES)
+        self.sentinels += int(is_sentinel.sum())
+
+        real = present[~is_sentinel]
+        if real.empty:
+            return
+        if not numeric:
+            real = real.astype(str)
+            if 'date' in self.name.lower():
+                parsed = pd.to_datetime(real, errors='coerce', format='ISO8601')
+                self.date_failures += int(parsed.isna().sum())
+        # Nulls are already removed, so skip pandas' per-call null mask
+        self._extend(real.min(skipna=False), real.max(skipna=False))
+
+    def _extend(self, low, high):
+        try:
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+        except TypeError:
+            # Column changed type between chunks; fall back to comparing as text
+            self.minimum = min(str(self.minimum), str(low))
+            self.maximum = max(str(self.maximum), str(high))
+
+    def merge(self, other):
+        self.nulls += other.nulls
+        self.sentinels += other.sentinels
+        self.date_failures += other.date_failures
+        self.distinct.merge(other.distinct)
+        if other.minimum is not None:
+            self._extend(other.minimum, other.maximum)
+
+    def to_dict(self, rows):
+        def _plain(value):
+            return value.item() if isinstance(value, np.generic) else value
+
+        return {
+            'nulls': self.nulls,
+            'null_rate': round(self.nulls / rows, 6) if rows else 0.0,
+            'sentinels': self.sentinels,
+            'sentinel_rate': round(self.sentinels / rows, 6) if rows else 0.0,
+            'approx_distinct': self.distinct.count(),
+            'min': _plain(self.minimum),
+            'max': _plain(self.maximum),
+            'date_failures': self.date_failures,
+        }
+
+
+class DataProfile:
+    """
+    Streaming profile of a dataset: per-column null, sentinel, approximate distinct,
+    min/max and date coercion failure counts, updated one frame or chunk at a time.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    def update(self, df):
+        self.rows += len(df)
+        missing = df.isna().to_numpy()
+        for position, column in enumerate(df.columns):
+            profile = self.columns.setdefault(column, ColumnProfile(column))
+            profile.update(df.iloc[:, position], missing[:, position])
+        return df
+
+    def merge(self, other):
+        """Adds another profile's counts, e.g. of a partition of the same dataset."""
+        self.rows += other.rows
+        for name, column in other.columns.items():
+            self.columns.setdefault(name, ColumnProfile(name)).merge(column)
+        return self
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'columns': {name: profile.to_dict(self.rows) for name, profile in self.columns.items()},
+        }
+
+    def save(self, filepath):
+        with open(filepath, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2, default=str)
+
+
+def profile_path(output_filepath):
+    """Returns where the profile of a stage output is stored, e.g. 'Assessment.csv.gz' -> 'Assessment.profile.json'."""
+    return os.path.splitext(strip_compression_suffix(output_filepath))[0] + '.profile.json'
+
+
+def state_path(output_filepath):
+    """Returns where the mergeable state of a partition profile is kept, e.g. 'part-00000.profile.pkl'."""
+    return os.path.splitext(strip_compression_suffix(output_filepath))[0] + '.profile.pkl'
+
+
+def keep_state():
+    """Makes this process also save the mergeable state of each profile (see KEEP_STATE)."""
+    global KEEP_STATE
+    KEEP_STATE = True
+
+
+def save_profile(profile, output_filepath):
+    """Saves the profile of `output_filepath`, and its state when KEEP_STATE is set."""
+    profile.save(profile_path(output_filepath))
+    if KEEP_STATE:
+        with open(state_path(output_filepath), 'wb') as file:
+            pickle.dump(profile, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def merge_profiles(partition_paths, output_filepath):
+    """
+    Saves the profile of a combined output by merging the saved states of its partitions,
+    so the combined file is not read again.
+
+    Parameters:
+    - partition_paths (list): Partition files, each profiled with KEEP_STATE set.
+    - output_filepath (str): The combined output.
+    """
+    if not DATA_PROFILING:
+        return
+    missing = [partition for partition in partition_paths if not os.path.exists(state_path(partition))]
+    if missing:
+        print(f"No profile for {output_filepath}: {len(missing)} partition(s) were written without one.")
+        return
+    profile = DataProfile()
+    for partition in partition_paths:
+        with open(state_path(partition), 'rb') as file:
+            profile.merge(pickle.load(file))
+    save_profile(profile, output_filepath)
+
+
+def profile_frame(df, output_filepath):
+    """
+    Profiles a stage's output frame and saves the profile alongside `output_filepath`.
+
+    Parameters:
+    - df (pd.DataFrame): The data being written.
+    - output_filepath (str): Path the data is written to.
+
+    Returns:
+    - pd.DataFrame: `df`, unchanged.
+    """
+    if DATA_PROFILING:
+        profile = DataProfile()
+        profile.update(df)
+        save_profile(profile, output_filepath)
+    return df
+
+
+def profile_chunks(frames, output_filepath):
+    """
+    Profiles chunks as they stream through to the writer, saving the profile once all have passed.
+
+    Parameters:
+    - frames (iterable): DataFrame chunks being written.
+    - output_filepath (str): Path the data is written to.
+
+    Yields:
+    - pd.DataFrame: Each chunk, unchanged.
+    """
+    if not DATA_PROFILING:
+        yield from frames
+        return
+    profile = DataProfile()
+    for frame in frames:
+        yield profile.update(frame)
+    save_profile(profile, output_filepath)
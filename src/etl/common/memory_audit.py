@@ -0,0 +1,75 @@
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+# Cleaners run under pandas copy-on-write unless COPY_ON_WRITE is set to 'off'.
+COPY_ON_WRITE = os.getenv('COPY_ON_WRITE', 'on').lower() != 'off'
+
+# Results of every `audit_allocations` block in this process, in the order they ran
+ALLOCATION_REPORT = []
+
+
+def enable_copy_on_write(enabled=COPY_ON_WRITE):
+    """
+    Switches pandas to copy-on-write, so column selections, renames and drops share data with
+    their parent frame and a column is only copied when it is actually modified.
+
+    pandas 3 always uses copy-on-write and no longer has the option, so this is a no-op there.
+
+    Parameters:
+    - enabled (bool): Turn copy-on-write on (True) or leave pandas' default behavior (False).
+    """
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', enabled)
+
+
+def copy_on_write_enabled():
+    """Returns the copy-on-write setting of this process, e.g. to start worker processes with the same one."""
+    if int(pd.__version__.split('.')[0]) < 3:
+        return pd.get_option('mode.copy_on_write')
+    return True
+
+
+def format_bytes(size):
+    """Formats a byte count for reports, e.g. 3145728 -> '3.0 MB'."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+
+
+@contextmanager
+def audit_allocations(stage):
+    """
+    Measures the memory a block allocates with tracemalloc and records it in ALLOCATION_REPORT.
+
+    numpy reports its array buffers to tracemalloc, so the peak covers DataFrame data as well as
+    Python objects. Work done in other processes (e.g. multi-file drops in `run_stage`) is not seen.
+
+    Parameters:
+    - stage (str): Name reported for the block.
+
+    Yields:
+    - dict: The report entry, filled in with 'seconds', 'peak_bytes' and 'retained_bytes' on exit.
+    """
+    entry = {'stage': stage}
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        entry['seconds'] = round(time.perf_counter() - start, 3)
+        entry['peak_bytes'] = peak - baseline
+        entry['retained_bytes'] = current - baseline
+        ALLOCATION_REPORT.append(entry)
+        print(f"[{stage}] peak {format_bytes(entry['peak_bytes'])}, "
+              f"retained {format_bytes(entry['retained_bytes'])}, {entry['seconds']}s")
@@ -0,0 +1,158 @@
+import queue
+import threading
+import pandas as pd
+from etl.common.compressed_io import open_text
+
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised on a background thread so it can be re-raised by the consumer."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def prefetch(iterable, max_pending=2):
+    """
+    Iterates over `iterable` on a background reader thread, keeping up to `max_pending` items ready.
+
+    The bounded queue provides backpressure: the reader blocks once it is `max_pending`
+    items ahead of the consumer, so at most that many chunks are held in memory.
+
+    Parameters:
+    - iterable (iterable): Source of items, typically a chunked `pd.read_csv` reader.
+    - max_pending (int): Maximum number of prefetched items waiting to be consumed.
+
+    Yields:
+    - Items from `iterable`, in order.
+    """
+    buffer = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader():
+        try:
+            for item in iterable:
+                if not _put(item):
+                    return
+        except BaseException as error:
+            _put(_Failure(error))
+            return
+        _put(_DONE)
+
+    thread = threading.Thread(target=_reader, name="prefetch-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def write_behind(items, write_item, max_pending=2):
+    """
+    Consumes `items` on the calling thread and hands each one to `write_item` on a background writer thread.
+
+    Any work done while producing `items` (e.g. a generator applying cleaning steps) runs on the
+    calling thread, overlapped with the writer flushing the previous item.
+
+    Parameters:
+    - items (iterable): Items to write, in order.
+    - write_item (callable): Called as `write_item(item, index)` for each item on the writer thread.
+    - max_pending (int): Maximum number of items waiting to be written.
+
+    Returns:
+    - int: Number of items written.
+    """
+    buffer = queue.Queue(maxsize=max_pending)
+    errors = []
+
+    def _writer():
+        index = 0
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if errors:
+                continue
+            try:
+                write_item(item, index)
+            except BaseException as error:
+                errors.append(error)
+            index += 1
+
+    thread = threading.Thread(target=_writer, name="write-behind-writer", daemon=True)
+    thread.start()
+    count = 0
+    try:
+        for item in items:
+            if errors:
+                break
+            buffer.put(item)
+            count += 1
+    finally:
+        buffer.put(_DONE)
+        thread.join()
+    if errors:
+        raise errors[0]
+    return count
+
+
+def read_csv_prefetched(filepath, chunksize, max_pending=2, **read_kwargs):
+    """
+    Reads a CSV file in chunks, prefetching the next chunks on a background thread.
+
+    Parameters:
+    - filepath (str): Path to the CSV file.
+    - chunksize (int): Number of rows per chunk.
+    - max_pending (int): Maximum number of chunks read ahead of the consumer.
+    - read_kwargs: Extra keyword arguments forwarded to `pd.read_csv`.
+
+    Yields:
+    - pd.DataFrame: Consecutive chunks of the file.
+    """
+    def _chunks():
+        with pd.read_csv(filepath, chunksize=chunksize, **read_kwargs) as reader:
+            yield from reader
+
+    return prefetch(_chunks(), max_pending=max_pending)
+
+
+def write_csv_behind(frames, output_filepath, max_pending=2, **write_kwargs):
+    """
+    Writes an iterable of DataFrames to a single CSV file on a background writer thread.
+
+    The header is written with the first frame only; later frames are appended without it.
+    The output is compressed as it streams out when `output_filepath` ends in '.gz' or '.zst'.
+
+    Parameters:
+    - frames (iterable): DataFrames to write, in order.
+    - output_filepath (str): Path to the output CSV file.
+    - max_pending (int): Maximum number of frames waiting to be written.
+    - write_kwargs: Extra keyword arguments forwarded to `DataFrame.to_csv`.
+
+    Returns:
+    - int: Number of frames written.
+    """
+    write_kwargs.setdefault('index', False)
+
+    with open_text(output_filepath, mode='w') as handle:
+        def _write(frame, index):
+            frame.to_csv(handle, header=index == 0, **write_kwargs)
+
+        return write_behind(frames, _write, max_pending=max_pending)
@@ -0,0 +1,416 @@
+import atexit
+import os
+import shutil
+import tempfile
+import pandas as pd
+from etl.common.compressed_io import compression_for, open_text
+from etl.common.data_profiler import (
+    DATA_PROFILING, HLL_PRECISION, NUMERIC_SENTINEL, TEXT_SENTINELS, ColumnProfile, DataProfile, save_profile,
+)
+
+# Optional dependency: select with backend='polars' (or ETL_BACKEND=polars for main.py)
+try:
+    import polars as pl
+except ImportError as error:
+    raise ImportError("The polars backend requires the 'polars' package (pip install polars).") from error
+
+# Strings pandas.read_csv treats as missing by default, so both backends see the same nulls.
+PANDAS_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# Date layouts seen in the raw files, tried in order.
+DATE_FORMATS = [
+    '%m/%d/%Y %I:%M:%S %p',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S%.f',
+    '%Y-%m-%d',
+]
+
+
+# Plain copies of compressed inputs scanned by plans that have not been sunk yet
+_DECOMPRESSED_FILES = []
+
+
+@atexit.register
+def _remove_decompressed_files():
+    """Removes the decompressed copies; `sink_csv` calls it once its plan has run, and it runs at exit for plans never sunk."""
+    while _DECOMPRESSED_FILES:
+        filepath = _DECOMPRESSED_FILES.pop()
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def _decompressed_copy(filepath):
+    """
+    Decompresses a '.gz'/'.zst' file to a temporary plain CSV, since `pl.scan_csv` only scans
+    plain files. The copy must outlive the lazy plan, so it is removed after the plan is sunk.
+    """
+    handle, plain_filepath = tempfile.mkstemp(suffix='.csv')
+    os.close(handle)
+    _DECOMPRESSED_FILES.append(plain_filepath)
+    with open_text(filepath, mode='r') as source, open(plain_filepath, 'w', newline='', encoding='utf-8') as target:
+        shutil.copyfileobj(source, target, 1 << 20)
+    return plain_filepath
+
+
+def _read_options(infer_types, dtype):
+    options = {'null_values': PANDAS_NA_VALUES}
+    if infer_types:
+        options['infer_schema_length'] = None
+    else:
+        options['infer_schema'] = False
+    if dtype:
+        options['schema_overrides'] = {name: pl.Float64 if kind == 'float64' else pl.Utf8 for name, kind in dtype.items()}
+    return options
+
+
+def scan_csv(filepath, infer_types=True, dtype=None):
+    """
+    Lazily scans a CSV file with pandas-compatible null handling.
+
+    Parameters:
+    - filepath (str): Path to the CSV file; '.gz'/'.zst' files are decompressed to a temporary
+      plain file first, so the scan keeps projection/predicate pushdown and streaming. The copy
+      is removed when the plan is written with `sink_csv`.
+    - infer_types (bool): Infer column types over the whole file (like `low_memory=False`);
+      when False every column is read as text.
+    - dtype (dict): pandas column types to read with, e.g. the common types of a multi-file drop;
+      'object' columns are read as text and 'float64' ones as floats.
+
+    Returns:
+    - pl.LazyFrame: Lazy scan of the file.
+    """
+    if compression_for(filepath):
+        filepath = _decompressed_copy(filepath)
+    return pl.scan_csv(filepath, **_read_options(infer_types, dtype))
+
+
+def read_csv(filepath, infer_types=True):
+    """
+    Eagerly reads a small lookup file with the same options as `scan_csv`. Compressed files are
+    read from the decompressed stream, without a temporary copy.
+    """
+    with open_text(filepath, mode='r') as file:
+        return pl.read_csv(file, **_read_options(infer_types, None))
+
+
+def read_dtypes(filepath):
+    """
+    Polars version of `batch_ingest.read_dtypes`: the types `scan_csv` infers over the whole file,
+    named like pandas dtypes so the files of a drop can be merged with `batch_ingest.common_dtypes`.
+    """
+    try:
+        schema = scan_csv(filepath).collect_schema()
+    finally:
+        _remove_decompressed_files()
+    return {
+        name: 'float64' if dtype.is_float() else 'int64' if dtype.is_integer() else 'object' if dtype == pl.Utf8 else str(dtype)
+        for name, dtype in schema.items()
+    }
+
+
+def _profile_plans(lf, schema):
+    """
+    Builds the aggregations behind a stage profile (see `data_profiler.ColumnProfile`) as lazy
+    plans over `lf`: one for the counts and min/max, one for the HyperLogLog registers of every
+    column, computed from Polars' row hashes the same way `HyperLogLog.add_hashes` does, so
+    partition profiles can be merged like the pandas ones.
+    """
+    stats, hashes = [pl.len().alias('rows')], []
+    remainder_bits = 64 - HLL_PRECISION
+    for position, (name, dtype) in enumerate(schema.items()):
+        numeric = dtype.is_numeric()
+        column = pl.col(name) if numeric else pl.col(name).cast(pl.Utf8)
+        sentinel = column == NUMERIC_SENTINEL if numeric else column.is_in(TEXT_SENTINELS)
+        real = column.filter(column.is_not_null() & ~sentinel)
+        stats += [
+            column.null_count().alias(f'{position}:nulls'),
+            sentinel.sum().alias(f'{position}:sentinels'),
+            real.min().alias(f'{position}:min'),
+            real.max().alias(f'{position}:max'),
+        ]
+        if not numeric and 'date' in name.lower():
+            parsed = pl.coalesce(real.str.to_date('%Y-%m-%d', strict=False),
+                                 real.str.to_datetime('%Y-%m-%d %H:%M:%S', strict=False).dt.date())
+            stats.append((real.count() - parsed.count()).alias(f'{position}:date_failures'))
+        hashed = pl.col(name).drop_nulls().hash()
+        hashes.append(lf.select(
+            pl.lit(position, pl.Int64).alias('column'),
+            (hashed // (1 << remainder_bits)).cast(pl.Int64).alias('index'),
+            ((hashed & ((1 << remainder_bits) - 1)).bitwise_leading_zeros().cast(pl.Int64) - HLL_PRECISION)
+            .clip(upper_bound=remainder_bits).add(1).alias('rank'),
+        ))
+    registers = pl.concat(hashes).group_by('column', 'index').agg(pl.col('rank').max())
+    return lf.select(stats), registers
+
+
+def _stage_profile(schema, stats, registers):
+    """Fills a `DataProfile` from the results of `_profile_plans`."""
+    profile = DataProfile()
+    stats = stats.row(0, named=True)
+    profile.rows = stats['rows']
+    for position, name in enumerate(schema.names()):
+        column = profile.columns[name] = ColumnProfile(name)
+        column.nulls = stats[f'{position}:nulls']
+        column.sentinels = stats[f'{position}:sentinels'] or 0
+        column.date_failures = stats.get(f'{position}:date_failures', 0)
+        column.minimum, column.maximum = stats[f'{position}:min'], stats[f'{position}:max']
+        ranks = registers.filter(pl.col('column') == position)
+        column.distinct.registers[ranks['index'].to_numpy()] = ranks['rank'].to_numpy()
+    return profile
+
+
+def sink_csv(lf, output_filepath):
+    """
+    Executes a lazy plan and writes the result to a CSV file.
+
+    With profiling off, the plan runs on the streaming engine straight into the file. With it
+    on, the result is collected once and both written and profiled from memory, so the output
+    is not parsed a second time (running the profile as a separate plan would scan the input
+    again). Compressed outputs are written to a temporary plain file next to the output and
+    then compressed through `open_text`.
+    """
+    compressed = compression_for(output_filepath)
+    plain_filepath = output_filepath
+    if compressed:
+        handle, plain_filepath = tempfile.mkstemp(suffix='.csv', dir=os.path.dirname(os.path.abspath(output_filepath)))
+        os.close(handle)
+    try:
+        if DATA_PROFILING:
+            df = lf.collect()
+            df.write_csv(plain_filepath)
+            stats, registers = pl.collect_all(_profile_plans(df.lazy(), df.schema))
+            save_profile(_stage_profile(df.schema, stats, registers), output_filepath)
+        else:
+            lf.sink_csv(plain_filepath)
+        if compressed:
+            with open(plain_filepath, newline='', encoding='utf-8') as source, open_text(output_filepath, mode='w') as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+    finally:
+        if compressed:
+            os.remove(plain_filepath)
+        # The plan has run, so the decompressed copies of its inputs are no longer needed
+        _remove_decompressed_files()
+    print(f"Data saved to {output_filepath}")
+
+
+def infer_date_format(lf, column):
+    """
+    Picks the DATE_FORMATS entry matching the first non-null value of a column, as pandas
+    infers one format per column; values in other layouts are then treated as missing.
+    Returns None if nothing matches, in which case every format is tried per value.
+    """
+    first = lf.select(pl.col(column).cast(pl.Utf8).drop_nulls().first()).collect().item()
+    for fmt in DATE_FORMATS:
+        parsed = pl.Series([first], dtype=pl.Utf8).str.to_datetime(fmt, strict=False)
+        if first is not None and parsed.null_count() == 0:
+            return fmt
+    return None
+
+
+def parse_dates(column, fmt=None):
+    """Parses a text column with `fmt`, or against all DATE_FORMATS, returning null where nothing matches."""
+    text = pl.col(column).cast(pl.Utf8)
+    if fmt:
+        return text.str.to_datetime(fmt, strict=False)
+    return pl.coalesce([text.str.to_datetime(candidate, strict=False) for candidate in DATE_FORMATS])
+
+
+def format_dates(lf, column, filler_date='9999-12-31'):
+    """Formats a date column as 'YYYY-MM-DD', filling unparseable or missing values with `filler_date`."""
+    parsed = parse_dates(column, infer_date_format(lf, column))
+    return parsed.dt.strftime('%Y-%m-%d').fill_null(filler_date).alias(column)
+
+
+def _underscore_names(lf):
+    names = lf.collect_schema().names()
+    return lf.rename({name: name.replace(' ', '_') for name in names if ' ' in name})
+
+
+def _fill_text_columns(lf, value):
+    schema = lf.collect_schema()
+    return lf.with_columns(pl.col(name).fill_null(value) for name, dtype in schema.items() if dtype == pl.Utf8)
+
+
+# Assessment stages
+
+def process_assessment_headers(input_filepath, output_filepath):
+    """Polars version of `csv_header_transformer.modify_and_export_csv_headers`."""
+    from etl.assessment.csv_header_transformer import transform_header
+
+    lf = scan_csv(input_filepath, infer_types=False)
+    headers = lf.collect_schema().names()
+    transformed = [headers[0]] + [transform_header(header) for header in headers[1:-4]] + headers[-4:]
+    sink_csv(lf.rename(dict(zip(headers, transformed))), output_filepath)
+
+
+def process_assessment_nulls(input_filepath, output_filepath, filler_date='9999-12-31'):
+    """Polars version of `null_replacer.clean_csv_data`."""
+    lf = scan_csv(input_filepath)
+    schema = lf.collect_schema()
+    # pandas reads a column with no values at all as float64 and fills it with -1;
+    # text columns keep their blanks, as pandas reads them as object columns
+    rows = lf.select(pl.len()).collect().item()
+    null_counts = lf.select(pl.all().null_count()).collect().row(0, named=True)
+    fills = []
+    for name, dtype in schema.items():
+        if rows and null_counts[name] == rows:
+            fills.append(pl.col(name).cast(pl.Float64).fill_null(-1))
+        elif dtype.is_numeric():
+            fills.append(pl.col(name).fill_null(-1))
+    lf = lf.with_columns(fills)
+    lf = lf.with_columns(format_dates(lf, name, filler_date) for name in schema.names() if 'date' in name.lower())
+    sink_csv(lf, output_filepath)
+
+
+def process_assessment_historic(assessment_filepath, parcel_filepath, output_filepath):
+    """Polars version of `historic_setter.load_and_process_assessment_data`."""
+    parcel_keys = read_csv(parcel_filepath).get_column('PRINT_KEY').cast(pl.Utf8)
+    lf = scan_csv(assessment_filepath).with_columns(
+        pl.col('Print_Key').cast(pl.Utf8).is_in(parcel_keys.implode()).cast(pl.Int64).alias('Historic_Property')
+    )
+    sink_csv(lf, output_filepath)
+
+
+def process_assessment_district_names(assessment_filepath, historic_keys_filepath, output_filepath):
+    """Polars version of `historic_district_name_setter.load_and_process_assessment_data`."""
+    historic_keys = read_csv(historic_keys_filepath).lazy().select('Print_Key', 'Historic_District_Name')
+    lf = scan_csv(assessment_filepath).join(
+        historic_keys, on='Print_Key', how='left', maintain_order='left'
+    ).with_columns(pl.col('Historic_District_Name').fill_null('UNKNOWN'))
+    sink_csv(lf, output_filepath)
+
+
+# Violations and court cases
+
+def process_code_violations(input_filepath, output_filepath, dtype=None):
+    """
+    Polars version of `code_violations_cleaner.process_code_violations`.
+    'Comments' still goes through `clean_text` per value, since it relies on BeautifulSoup.
+    """
+    from etl.code_violations.code_violations_cleaner import clean_text
+
+    lf = scan_csv(input_filepath, dtype=dtype)
+    names = lf.collect_schema().names()
+    lf = lf.select(names[:names.index('Address') + 1])
+    lf = lf.with_columns(pl.col('SBL', 'Address').fill_null('UNKNOWN'))
+    lf = _underscore_names(lf)
+    lf = lf.drop('Prop_Class', strict=False)
+    lf = lf.with_columns(
+        pl.col('SBL').cast(pl.Utf8),
+        parse_dates('Date', infer_date_format(lf, 'Date')).dt.date().alias('Date'),
+    )
+    names = lf.collect_schema().names()
+    if 'Violation_Location' in names:
+        lf = lf.with_columns(pl.col('Violation_Location').fill_null('N/A'))
+    if 'Comments' in names:
+        lf = lf.with_columns(pl.col('Comments').map_elements(clean_text, return_dtype=pl.Utf8, skip_nulls=False))
+    sink_csv(lf, output_filepath)
+
+
+def process_housing_violations(input_filepath, output_filepath, dtype=None):
+    """Polars version of `violations_cleaner.process_housing_data`."""
+    columns_to_drop = [
+        'City', 'State', 'X Coordinate', 'Y Coordinate', 'Address Number', 'Address Line 1',
+        'Address Line 2', 'Zipcode', 'Location', 'Latitude', 'Longitude', 'Council District',
+        'Police District', 'Census Tract', 'Census Block Group', 'Census Block', 'Neighborhood'
+    ]
+    lf = scan_csv(input_filepath, dtype=dtype).drop(columns_to_drop, strict=False)
+    names = lf.collect_schema().names()
+    if 'Type' in names:
+        lf = lf.with_columns(pl.col('Type').str.replace_all(r'\(Req_Serv\)', '').str.strip_chars())
+    lf = lf.rename({'Property ID': 'Print Key'}, strict=False)
+    if 'Print Key' in lf.collect_schema().names():
+        # Matches pandas' astype(str): missing keys become the text 'nan' and are kept
+        key = pl.col('Print Key').cast(pl.Utf8).fill_null('nan')
+        lf = lf.with_columns(key).filter(~pl.col('Print Key').str.contains(r'^\d+$'))
+    lf = lf.with_columns(format_dates(lf, name) for name in ['Open Date', 'Closed Date'] if name in names)
+    lf = _fill_text_columns(_underscore_names(lf), 'UNKNOWN')
+    sink_csv(lf, output_filepath)
+
+
+def process_housing_court_cases(input_filepath, output_filepath, dtype=None):
+    """Polars version of `housing_court_case_cleaner.process_housing_data`."""
+    lf = scan_csv(input_filepath, dtype=dtype)
+    names = lf.collect_schema().names()
+    if 'Contact' in names:
+        lf = lf.select(names[:names.index('Contact') + 1])
+        names = lf.collect_schema().names()
+    lf = lf.with_columns(pl.col(name).fill_null('UNKNOWN') for name in ['Address', 'Contact', 'Resolution'] if name in names)
+    lf = lf.with_columns(format_dates(lf, name) for name in ['Resolution Date', 'Last Action', 'Case Add Date'] if name in names)
+    lf = _underscore_names(lf).drop(['City', 'State', 'Zipcode'], strict=False)
+    sink_csv(lf, output_filepath)
+
+
+# Local assessment and bank codes
+
+def process_local_assessment(input_filepath, stage_filepath, output_filepath, dtype=None):
+    """Polars version of `local_assessmnet_cleaner.process_assessment_data`."""
+    local = scan_csv(input_filepath, dtype=dtype).rename({'PrintKeyCode': 'PrintKey'}, strict=False)
+    local = local.select("RollYear", "PrintKey", "Bank", "FullMarketValue", "CountyTaxableValue", "SchoolTaxable")
+    fill_values = {"Bank": "UNKNOWN", "FullMarketValue": "-1", "CountyTaxableValue": "N/A", "SchoolTaxable": "N/A"}
+    # pandas reads integer columns with gaps as float64, so their values are written as e.g. '1.0'
+    schema = local.collect_schema()
+    null_counts = local.select(pl.col(list(fill_values)).null_count()).collect().row(0, named=True)
+    local = local.with_columns(
+        (pl.col(col).cast(pl.Float64) if schema[col].is_integer() and null_counts[col] else pl.col(col))
+        .cast(pl.Utf8).fill_null(value)
+        for col, value in fill_values.items()
+    )
+
+    assessment = scan_csv(stage_filepath).rename({'Print_Key': 'PrintKey'}, strict=False)
+
+    # pandas.merge suffixes overlapping columns with _x/_y; keep the same output names
+    overlap = set(assessment.collect_schema().names()) & set(local.collect_schema().names()) - {'PrintKey'}
+    assessment = assessment.rename({name: f"{name}_x" for name in overlap})
+    local = local.rename({name: f"{name}_y" for name in overlap})
+
+    lf = assessment.join(local, on='PrintKey', how='left', maintain_order='left').filter(pl.col('RollYear') == 2023)
+    sink_csv(lf, output_filepath)
+
+
+def process_bank_codes(input_filepath, output_filepath, dtype=None):
+    """Polars version of `bank_cleaner.load_and_process_data`."""
+    lf = scan_csv(input_filepath, dtype=dtype)
+    names = lf.collect_schema().names()
+    lf = lf.rename({name: name.strip().upper().replace(' ', '_') for name in names})
+    names = lf.collect_schema().names()
+    bank_name = pl.concat_str([pl.col(name).cast(pl.Utf8) for name in names[1:]], separator=' ', ignore_nulls=True)
+    lf = lf.select('BANK_CODE', bank_name.str.to_uppercase().replace('', 'UNKNOWN').alias('BANK_NAME'))
+    sink_csv(lf, output_filepath)
+
+
+# Parity checks
+
+def compare_csv_outputs(pandas_filepath, polars_filepath):
+    """
+    Asserts that two stage outputs hold the same data.
+
+    Both files are read back with pandas so formatting-only differences (e.g. '1' vs '1.0'
+    for a numeric column) are ignored; values, column names and row order must match.
+    """
+    expected = pd.read_csv(pandas_filepath, low_memory=False)
+    actual = pd.read_csv(polars_filepath, low_memory=False)
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+
+
+def verify_parity(process, *input_filepaths):
+    """
+    Runs a cleaner's `process_*` function with both backends and asserts the outputs match.
+
+    Parameters:
+    - process (callable): A stage function taking input paths, an output path and `backend`,
+      e.g. `housing_court_case_cleaner.process_housing_data`.
+    - input_filepaths (str): Input paths passed to `process` before the output path.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        outputs = {}
+        for backend in ('pandas', 'polars'):
+            outputs[backend] = os.path.join(tmp_dir, f"{backend}.csv")
+            process(*input_filepaths, outputs[backend], backend=backend)
+        compare_csv_outputs(outputs['pandas'], outputs['polars'])
+    print(f"{process.__module__}.{process.__name__}: pandas and polars outputs match.")
@@ -2,6 +2,8 @@ import os
 import pandas as pd
 import snowflake.connector
 from dotenv import load_dotenv
+from etl.common.compressed_io import source_compression_for, strip_compression_suffix
+from etl.common.config import PROD_FILE_PATH, RAW_FILE_PATH, STAGE_FILE_PATH
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,25 +17,65 @@ SNOWFLAKE_WAREHOUSE = os.getenv('SNOWFLAKE_WAREHOUSE')
 
 # Define the directory paths and corresponding schemas
 DATA_DIRECTORIES = {
-    "raw": os.getenv('RAW_FILE_PATH'),
-    "stage": os.getenv('STAGE_FILE_PATH'),
-    "prod": os.getenv('PROD_FILE_PATH')
+    "raw": RAW_FILE_PATH,
+    "stage": STAGE_FILE_PATH,
+    "prod": PROD_FILE_PATH
 }
 
-# Step 1: Establish a connection to Snowflake
-print("Connecting to Snowflake...")
-conn = snowflake.connector.connect(
-    user=SNOWFLAKE_USER,
-    password=SNOWFLAKE_PASSWORD,
-    account=SNOWFLAKE_ACCOUNT,
-    warehouse=SNOWFLAKE_WAREHOUSE,
-    database=SNOWFLAKE_DATABASE
-)
-print("Successfully connected to Snowflake.")
-
-def run_data_upload_pipeline():
+def connect():
+    """Establish a connection to Snowflake."""
+    print("Connecting to Snowflake...")
+    conn = snowflake.connector.connect(
+        user=SNOWFLAKE_USER,
+        password=SNOWFLAKE_PASSWORD,
+        account=SNOWFLAKE_ACCOUNT,
+        warehouse=SNOWFLAKE_WAREHOUSE,
+        database=SNOWFLAKE_DATABASE
+    )
+    print("Successfully connected to Snowflake.")
+    return conn
+
+def list_csv_files(folder_path):
+    """
+    Lists the CSV files to upload from a folder, keyed by table name.
+
+    Plain, '.csv.gz' and '.csv.zst' files are all picked up. If the same table has several
+    variants (e.g. an old 'Assessment.csv' next to a new 'Assessment.csv.gz'), the most
+    recently modified file is used.
+
+    Parameters:
+    - folder_path (str): Folder to scan.
+
+    Returns:
+    - dict: Table name -> file name.
+    """
+    files = {}
+    for filename in os.listdir(folder_path):
+        if not strip_compression_suffix(filename).endswith(".csv"):
+            continue
+        table_name = os.path.splitext(strip_compression_suffix(filename))[0]
+        current = files.get(table_name)
+        if current is None or (os.path.getmtime(os.path.join(folder_path, filename))
+                               > os.path.getmtime(os.path.join(folder_path, current))):
+            files[table_name] = filename
+    return files
+
+def run_data_upload_pipeline(tables=None):
+    """
+    Uploads the raw, stage and prod CSV files to their Snowflake schemas. Each uploaded table
+    is recreated from its file's header and reloaded, so re-running an upload replaces rows
+    instead of appending duplicates, and columns added to a file appear in the table.
+
+    Parameters:
+    - tables (dict, optional): Schema -> table names to upload, e.g. {'prod': {'Code_Violations'}}.
+      Uploads every file when omitted.
+    """
+    # Open a fresh connection per run so repeated uploads (e.g. watch mode) work
+    conn = connect()
     try:
         for schema, folder_path in DATA_DIRECTORIES.items():
+            if tables is not None and not tables.get(schema):
+                continue
             # Step 1: Ensure the schema exists; create if it doesn't
             print(f"Checking if schema '{schema}' exists...")
             create_schema_query = f"CREATE SCHEMA IF NOT EXISTS {SNOWFLAKE_DATABASE}.{schema};"
@@ -44,41 +86,50 @@ def run_data_upload_pipeline():
             conn.cursor().execute(f"USE SCHEMA {schema};")
 
             # Step 2: Process each CSV file in the folder
-            for filename in os.listdir(folder_path):
-                if filename.endswith(".csv"):
-                    table_name = os.path.splitext(filename)[0]  # Use the filename (without extension) as the table name
-                    csv_file_path = os.path.join(folder_path, filename)
-
-                    # Load the CSV file to get column names
-                    print(f"Loading CSV file from {csv_file_path} for table {table_name}...")
-                    df = pd.read_csv(csv_file_path)
-
-                    # Define table schema with quoted column names and VARCHAR data type
-                    column_names = [f'"{col.replace(" ", "_")}" VARCHAR' for col in df.columns]
-                    table_schema = ", ".join(column_names)
-
-                    # Step 3: Create the table if it doesn't exist
-                    print(f"Creating table '{table_name}' in schema '{schema}' if it doesn't exist...")
-                    create_table_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({table_schema});"
-                    conn.cursor().execute(create_table_query)
-                    print(f"Table '{table_name}' is ready.")
-
-                    # Step 4: Upload file to Snowflake table stage
-                    print(f"Uploading file {csv_file_path} to Snowflake stage for table {table_name}...")
-                    put_command = f"PUT 'file://{csv_file_path}' @%{table_name} AUTO_COMPRESS=TRUE;"
-                    conn.cursor().execute(put_command)
-                    print(f"File {csv_file_path} uploaded successfully to stage.")
-
-                    # Step 5: Load data into Snowflake table
-                    print(f"Loading data from {csv_file_path} into table '{table_name}'...")
-                    copy_into_query = f"""
-                    COPY INTO {table_name}
-                    FROM @%{table_name}/{filename}
-                    FILE_FORMAT = (TYPE = 'CSV' FIELD_OPTIONALLY_ENCLOSED_BY='"' SKIP_HEADER = 1)
-                    ON_ERROR = 'CONTINUE';
-                    """
-                    conn.cursor().execute(copy_into_query)
-                    print(f"Data successfully loaded into '{table_name}' from {csv_file_path}.")
+            for table_name, filename in list_csv_files(folder_path).items():
+                if tables is not None and table_name not in tables[schema]:
+                    continue
+                csv_file_path = os.path.join(folder_path, filename)
+
+                # Load the CSV header to get column names (compression is inferred from the extension)
+                print(f"Loading CSV file from {csv_file_path} for table {table_name}...")
+                df = pd.read_csv(csv_file_path, nrows=0)
+
+                # Define table schema with quoted column names and VARCHAR data type
+                column_names = [f'"{col.replace(" ", "_")}" VARCHAR' for col in df.columns]
+                table_schema = ", ".join(column_names)
+
+                # Step 3: (Re)create the table from the file's header. Each file holds the whole table,
+                # so replacing it drops the old rows, picks up added or removed columns and resets the
+                # load history so COPY does not skip a re-staged file.
+                print(f"Creating table '{table_name}' in schema '{schema}'...")
+                create_table_query = f"CREATE OR REPLACE TABLE {table_name} ({table_schema});"
+                conn.cursor().execute(create_table_query)
+                print(f"Table '{table_name}' is ready.")
+
+                # Step 4: Upload file to Snowflake table stage
+                print(f"Uploading file {csv_file_path} to Snowflake stage for table {table_name}...")
+                # Already-compressed files are staged as-is so they are not compressed a second time;
+                # OVERWRITE replaces a staged file of the same name left by an earlier upload
+                source_compression = source_compression_for(filename)
+                if source_compression:
+                    put_command = (f"PUT 'file://{csv_file_path}' @%{table_name} "
+                                   f"AUTO_COMPRESS=FALSE SOURCE_COMPRESSION={source_compression} OVERWRITE=TRUE;")
+                else:
+                    put_command = f"PUT 'file://{csv_file_path}' @%{table_name} AUTO_COMPRESS=TRUE OVERWRITE=TRUE;"
+                conn.cursor().execute(put_command)
+                print(f"File {csv_file_path} uploaded successfully to stage.")
+
+                # Step 5: Load data into Snowflake table
+                print(f"Loading data from {csv_file_path} into table '{table_name}'...")
+                copy_into_query = f"""
+                COPY INTO {table_name}
+                FROM @%{table_name}/{filename}
+                FILE_FORMAT = (TYPE = 'CSV' FIELD_OPTIONALLY_ENCLOSED_BY='"' SKIP_HEADER = 1)
+                ON_ERROR = 'CONTINUE';
+                """
+                conn.cursor().execute(copy_into_query)
+                print(f"Data successfully loaded into '{table_name}' from {csv_file_path}.")
 
     finally:
         # Close the connection
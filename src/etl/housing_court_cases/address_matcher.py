@@ -0,0 +1,229 @@
+import re
+from difflib import SequenceMatcher
+import pandas as pd
+from etl.common.compressed_io import output_path, remove_other_variants
+from etl.common.config import prod_path
+from etl.common.data_profiler import profile_frame
+
+STREET_SUFFIXES = {
+    'AVENUE': 'AVE', 'AV': 'AVE', 'AVN': 'AVE', 'STREET': 'ST', 'STR': 'ST', 'ROAD': 'RD',
+    'DRIVE': 'DR', 'DRV': 'DR', 'BOULEVARD': 'BLVD', 'BLV': 'BLVD', 'PLACE': 'PL', 'COURT': 'CT',
+    'LANE': 'LN', 'TERRACE': 'TER', 'TERR': 'TER', 'PARKWAY': 'PKWY', 'PKY': 'PKWY', 'CIRCLE': 'CIR',
+    'HIGHWAY': 'HWY', 'SQUARE': 'SQ', 'ALLEY': 'ALY', 'EXPRESSWAY': 'EXPY', 'TRAIL': 'TRL', 'WAY': 'WAY',
+}
+DIRECTIONALS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'NORTHEAST': 'NE', 'NORTHWEST': 'NW', 'SOUTHEAST': 'SE', 'SOUTHWEST': 'SW',
+}
+STREET_WORDS = {
+    'SAINT': 'ST', 'MOUNT': 'MT', 'FORT': 'FT',
+    'FIRST': '1ST', 'SECOND': '2ND', 'THIRD': '3RD', 'FOURTH': '4TH', 'FIFTH': '5TH',
+    'SIXTH': '6TH', 'SEVENTH': '7TH', 'EIGHTH': '8TH', 'NINTH': '9TH', 'TENTH': '10TH',
+}
+TOKEN_MAP = {**STREET_WORDS, **DIRECTIONALS, **STREET_SUFFIXES}
+
+_TOKEN_PATTERN = re.compile(r'\b(' + '|'.join(sorted(TOKEN_MAP, key=len, reverse=True)) + r')\b')
+# Unit designators and everything after them, e.g. 'APT 2', '# 3'
+_UNIT_PATTERN = r'\s+(?:APT|APARTMENT|UNIT|STE|SUITE|FLOOR|RM|ROOM|#)\b.*$|\s*#.*$'
+# Words that name a unit only after the street, e.g. '12 MAIN ST REAR' or '12 ELM UPPER', but are
+# street names elsewhere ('45 FRONT AVE', '10 LOWER TER'); stripped after a suffix or at the end only
+_POSITION_WORDS = r'(?:FL|UPPER|UPR|LOWER|LWR|REAR|FRONT)'
+_SUFFIX_WORDS = '|'.join(sorted(set(STREET_SUFFIXES) | set(STREET_SUFFIXES.values()), key=len, reverse=True))
+_UNIT_AFTER_SUFFIX_PATTERN = r'\b(' + _SUFFIX_WORDS + r')\s+' + _POSITION_WORDS + r'\b.*$'
+_UNIT_AT_END_PATTERN = r'^(\d\S*\s+.*\S)\s+' + _POSITION_WORDS + r'(?:\s+(?:\d+[A-Z]?|[A-Z]))?$'
+# House number (ranges like '101-103' and letters like '12A' keep the leading number) and street
+_NUMBER_PATTERN = r'^(?P<house_number>\d+)[A-Z]?(?:\s*-\s*\d+[A-Z]?)?\s+(?P<street>.+)$'
+
+_SUFFIX_VALUES = sorted(set(STREET_SUFFIXES.values()))
+_DIRECTIONAL_VALUES = sorted(set(DIRECTIONALS.values()))
+# Leading directional, street without them and trailing suffix, e.g. 'N MAIN ST' -> 'N', 'MAIN', 'ST'
+_BASE_PATTERN = (r'^(?:(?P<directional>' + '|'.join(_DIRECTIONAL_VALUES) + r')\s+)?(?P<base>.+?)'
+                 r'(?:\s+(?P<suffix>' + '|'.join(_SUFFIX_VALUES) + r'))?$')
+
+FUZZY_THRESHOLD = 0.85
+# Confidence of a match found only after dropping the suffix/directional
+BASE_MATCH_CONFIDENCE = 0.9
+
+
+def normalize_addresses(addresses):
+    """
+    Canonicalizes street addresses into a house number and street.
+
+    - Upper-cases, strips punctuation and unit designators ('APT 2', '#3'). Position words such as
+      'UPPER', 'REAR' or 'FRONT' are only stripped after the street suffix or at the end.
+    - Keeps the first number of a range and drops leading zeros ('0101-0103' -> '101').
+    - Abbreviates suffixes, directionals and common words ('AVENUE' -> 'AVE', 'NORTH' -> 'N', 'SAINT' -> 'ST').
+
+    Only distinct values are normalized, so heavily repeated addresses cost one pass each.
+
+    Parameters:
+    - addresses (pd.Series): Raw address strings.
+
+    Returns:
+    - pd.DataFrame: 'House_Number', 'Street', 'Street_Base' (street without suffix or leading
+      directional), 'Directional' and 'Suffix' columns aligned with `addresses`; null where
+      unparseable or absent.
+    """
+    codes, uniques = pd.factorize(addresses.astype('string').str.upper(), use_na_sentinel=True)
+    text = pd.Series(uniques, dtype='string')
+    text = text.str.replace(r"[.,']", '', regex=True).str.replace(r'\s+', ' ', regex=True).str.strip()
+    text = text.str.replace(_UNIT_PATTERN, '', regex=True)
+    text = text.str.replace(_UNIT_AFTER_SUFFIX_PATTERN, r'\1', regex=True)
+    text = text.str.replace(_UNIT_AT_END_PATTERN, r'\1', regex=True)
+    parts = text.str.extract(_NUMBER_PATTERN)
+    street = parts['street'].str.replace(_TOKEN_PATTERN, lambda match: TOKEN_MAP[match.group(1)], regex=True)
+    street = street.str.replace(r'\s+', ' ', regex=True).str.strip()
+    street_parts = street.str.extract(_BASE_PATTERN)
+    normalized = pd.DataFrame({
+        'House_Number': parts['house_number'].str.lstrip('0').replace('', '0'),
+        'Street': street,
+        'Street_Base': street_parts['base'],
+        'Directional': street_parts['directional'],
+        'Suffix': street_parts['suffix'],
+    })
+    normalized = normalized.reindex(codes).reset_index(drop=True)
+    normalized.index = addresses.index
+    return normalized
+
+
+def build_parcel_index(assessment_df, address_column='Address', key_column='Print_Key'):
+    """
+    Builds the address index used to match addresses to parcels.
+
+    Parameters:
+    - assessment_df (pd.DataFrame): Assessment data with an address and Print_Key column.
+    - address_column (str): Column holding the parcel address.
+    - key_column (str): Column holding the Print_Key.
+
+    Returns:
+    - pd.DataFrame: Normalized parcel addresses with their Print_Key, ready for `match_addresses`.
+    """
+    index = normalize_addresses(assessment_df[address_column])
+    index['Print_Key'] = assessment_df[key_column].astype(str).values
+    return index.dropna(subset=['House_Number', 'Street']).reset_index(drop=True)
+
+
+def _agrees(address_part, parcel_part):
+    """True where a directional or suffix is missing on either side or the same on both."""
+    return (pd.isna(address_part) | parcel_part.isna() | (parcel_part == address_part)).astype(bool)
+
+
+def _exact_matches(keys, parcel_index, street_column, confidence):
+    """
+    Hash-joins addresses to parcels on (House_Number, street_column). Pairs whose directionals
+    or suffixes differ ('N MAIN ST' and 'S MAIN ST', 'ELM ST' and 'ELM AVE') are not matches;
+    the street base may only fill in a part one side lacks.
+    """
+    parcels = parcel_index[['House_Number', street_column, 'Directional', 'Suffix', 'Print_Key']]
+    parcels = parcels.dropna(subset=['House_Number', street_column, 'Print_Key'])
+    matches = keys[['House_Number', 'Street', 'Street_Base', 'Directional', 'Suffix']].merge(
+        parcels, on=['House_Number', street_column], how='inner', suffixes=('', '_Parcel'))
+    if street_column != 'Street':
+        matches = matches[_agrees(matches['Directional'], matches['Directional_Parcel'])
+                          & _agrees(matches['Suffix'], matches['Suffix_Parcel'])]
+    # Several parcels can share an address (e.g. condos); keep the first and count the rest as ambiguity
+    matches = matches.assign(Candidates=matches.groupby(['House_Number', 'Street'])['Print_Key'].transform('size'))
+    matches = matches.drop_duplicates(subset=['House_Number', 'Street'])
+    return matches.assign(Match_Confidence=confidence / matches['Candidates'])
+
+
+def _fuzzy_matches(keys, parcel_index, threshold):
+    """
+    Matches street bases against parcels with the same house number, the blocking key.
+
+    This is a plain Python loop: each address's street base is compared with SequenceMatcher
+    against every parcel in its block whose directional and suffix do not conflict with the
+    address's. It only sees the addresses the exact passes left over.
+    """
+    parcels = parcel_index.dropna(subset=['Street_Base']).drop_duplicates(subset=['House_Number', 'Street'])
+    parcels_by_number = {number: group for number, group in parcels.groupby('House_Number')}
+    matches = []
+    columns = ['House_Number', 'Street', 'Street_Base', 'Directional', 'Suffix']
+    for house_number, street, street_base, directional, suffix in keys[columns].itertuples(index=False):
+        block = parcels_by_number.get(house_number)
+        if block is None or pd.isna(street_base):
+            continue
+        block = block[_agrees(directional, block['Directional']) & _agrees(suffix, block['Suffix'])]
+        if block.empty:
+            continue
+        scores = [SequenceMatcher(None, street_base, candidate).ratio() for candidate in block['Street_Base']]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best] >= threshold:
+            confidence = scores[best] * BASE_MATCH_CONFIDENCE
+            matches.append((house_number, street, block['Print_Key'].iloc[best], confidence))
+    return pd.DataFrame(matches, columns=['House_Number', 'Street', 'Print_Key', 'Match_Confidence'])
+
+
+def match_addresses(addresses, parcel_index, threshold=FUZZY_THRESHOLD):
+    """
+    Assigns a Print_Key to each address, trying in order:
+    - an exact match on the normalized (House_Number, Street) (confidence 1.0),
+    - an exact match on the street without suffix/directional ('676 RILEY' -> '676 RILEY ST', confidence 0.9),
+      when neither differs between the two sides ('N MAIN ST' never matches 'S MAIN ST'),
+    - a fuzzy street match among parcels with the same house number (confidence 0.9 x similarity).
+
+    The exact passes are hash joins over distinct addresses, and the fuzzy pass only compares
+    against the parcels sharing a house number, so the work grows with the number of distinct
+    addresses rather than addresses x parcels. Confidence is divided by the number of parcels
+    sharing the matched address.
+
+    Parameters:
+    - addresses (pd.Series): Raw address strings.
+    - parcel_index (pd.DataFrame): Output of `build_parcel_index`.
+    - threshold (float): Minimum street similarity (0-1) for a fuzzy match.
+
+    Returns:
+    - pd.DataFrame: 'Print_Key' ('UNKNOWN' if unmatched) and 'Match_Confidence' (0-1) aligned with `addresses`.
+    """
+    normalized = normalize_addresses(addresses)
+    pending = normalized.dropna(subset=['House_Number', 'Street']).drop_duplicates(subset=['House_Number', 'Street'])
+
+    matched = []
+    for street_column, confidence in [('Street', 1.0), ('Street_Base', BASE_MATCH_CONFIDENCE)]:
+        found = _exact_matches(pending, parcel_index, street_column, confidence)
+        matched.append(found[['House_Number', 'Street', 'Print_Key', 'Match_Confidence']])
+        pending = pending[~pending.set_index(['House_Number', 'Street']).index.isin(
+            found.set_index(['House_Number', 'Street']).index)]
+    matched.append(_fuzzy_matches(pending, parcel_index, threshold))
+
+    matched = pd.concat([frame for frame in matched if not frame.empty] or matched[:1], ignore_index=True)
+    matched['Match_Confidence'] = matched['Match_Confidence'].astype(float).round(3)
+    result = normalized[['House_Number', 'Street']].merge(matched, on=['House_Number', 'Street'], how='left')
+    result.index = addresses.index
+    result['Print_Key'] = result['Print_Key'].fillna('UNKNOWN')
+    result['Match_Confidence'] = result['Match_Confidence'].fillna(0.0)
+    return result[['Print_Key', 'Match_Confidence']]
+
+
+def link_court_cases_to_parcels(court_filepath, assessment_filepath, output_filepath,
+                                address_column='Address', assessment_address_column='Address'):
+    """
+    Adds 'Print_Key' and 'Match_Confidence' columns to the cleaned housing court cases.
+
+    Parameters:
+    - court_filepath (str): Cleaned housing court cases CSV.
+    - assessment_filepath (str): Prod assessment CSV providing parcel addresses and Print_Keys.
+    - output_filepath (str): Where to save the linked court cases (may equal `court_filepath`).
+    - address_column (str): Address column in the court cases.
+    - assessment_address_column (str): Address column in the assessment data.
+    """
+    court_df = pd.read_csv(court_filepath, low_memory=False)
+    assessment_df = pd.read_csv(assessment_filepath, usecols=[assessment_address_column, 'Print_Key'], low_memory=False)
+
+    parcel_index = build_parcel_index(assessment_df, assessment_address_column)
+    court_df = court_df.drop(columns=['Print_Key', 'Match_Confidence'], errors='ignore')
+    court_df[['Print_Key', 'Match_Confidence']] = match_addresses(court_df[address_column], parcel_index)
+
+    profile_frame(court_df, output_filepath)
+    court_df.to_csv(output_filepath, index=False)
+    matched = (court_df['Print_Key'] != 'UNKNOWN').sum()
+    print(f"Linked {matched} of {len(court_df)} court cases to parcels. Results saved to '{output_filepath}'")
+
+
+# Example function for use in a main script
+def run_court_case_parcel_linking():
+    court_filepath = output_path(prod_path('Housing_Court_Cases.csv'))
+    assessment_filepath = output_path(prod_path('Assessment.csv'))
+    link_court_cases_to_parcels(court_filepath, assessment_filepath, court_filepath)
+    remove_other_variants(court_filepath)
+    print("Housing court case parcel linking completed successfully.")
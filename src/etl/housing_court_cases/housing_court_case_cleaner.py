@@ -1,8 +1,18 @@
 import pandas as pd
+from etl.common.data_profiler import profile_chunks, profile_frame
+from etl.common.pipelined_io import read_csv_prefetched, write_csv_behind
+from etl.common.batch_ingest import run_stage
+from etl.common.compressed_io import output_path
+from etl.common.config import check_backend, raw_path, prod_path
 
-def load_data(input_filepath: str) -> pd.DataFrame:
-    """Load dataset from a CSV file."""
-    return pd.read_csv(input_filepath)
+def load_data(input_filepath: str, chunksize: int = None, dtype: dict = None):
+    """
+    Load dataset from a CSV file, reading the columns in `dtype` with the given types.
+    When `chunksize` is given, returns an iterator of chunks prefetched on a background thread.
+    """
+    if chunksize:
+        return read_csv_prefetched(input_filepath, chunksize, dtype=dtype)
+    return pd.read_csv(input_filepath, dtype=dtype)
 
 def keep_columns_up_to_contact(df: pd.DataFrame) -> pd.DataFrame:
     """Keep columns up to 'Contact' and remove all columns to the right."""
@@ -14,26 +24,25 @@ def keep_columns_up_to_contact(df: pd.DataFrame) -> pd.DataFrame:
 def handle_missing_address(df: pd.DataFrame, address_column: str = 'Address') -> pd.DataFrame:
     """Replace empty or NaN values in address column with 'UNKNOWN'."""
     if address_column in df.columns:
-        df[address_column].fillna("UNKNOWN", inplace=True)
+        df[address_column] = df[address_column].fillna("UNKNOWN")
     return df
 
 def handle_missing_contact(df: pd.DataFrame, contact_column: str = 'Contact') -> pd.DataFrame:
     """Replace empty or NaN values in contact column with 'UNKNOWN'."""
     if contact_column in df.columns:
-        df[contact_column].fillna("UNKNOWN", inplace=True)
+        df[contact_column] = df[contact_column].fillna("UNKNOWN")
     return df
 
 def handle_resolution_column(df: pd.DataFrame) -> pd.DataFrame:
     """Replace empty or NaN values in 'Resolution' column with 'UNKNOWN'."""
     if 'Resolution' in df.columns:
-        df['Resolution'].fillna("UNKNOWN", inplace=True)
+        df['Resolution'] = df['Resolution'].fillna("UNKNOWN")
     return df
 
 def handle_date_column(df: pd.DataFrame, column_name: str, filler_date: str = "9999-12-31") -> pd.DataFrame:
     """Convert a date column to date-only format and fill NaT values with filler_date."""
     if column_name in df.columns:
-        df[column_name] = pd.to_datetime(df[column_name], errors='coerce').dt.strftime("%Y-%m-%d")
-        df[column_name].fillna(filler_date, inplace=True)
+        df[column_name] = pd.to_datetime(df[column_name], errors='coerce').dt.strftime("%Y-%m-%d").fillna(filler_date)
     return df
 
 def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -45,23 +54,28 @@ def drop_unwanted_columns(df: pd.DataFrame, columns_to_drop: list = ['City', 'St
     """Drop specified columns if they exist in the dataframe."""
     return df.drop(columns=[col for col in columns_to_drop if col in df.columns], errors='ignore')
 
-def save_data(df: pd.DataFrame, output_filepath: str) -> None:
-    """Save the modified dataframe to a new CSV file."""
-    df.to_csv(output_filepath, index=False)
+def save_data(df, output_filepath: str) -> None:
+    """
+    Save the modified dataframe to a new CSV file.
+    Also accepts an iterable of chunks, which are written on a background thread as they arrive.
+    """
+    if isinstance(df, pd.DataFrame):
+        profile_frame(df, output_filepath)
+        df.to_csv(output_filepath, index=False)
+    else:
+        write_csv_behind(profile_chunks(df, output_filepath), output_filepath)
     print(f"Data saved to {output_filepath}")
 
-def process_housing_data(input_filepath: str, output_filepath: str) -> None:
+def clean_housing_data(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Main function to process housing court cases data:
+    Apply the housing court cases cleaning steps to a dataframe:
     - Keeps columns up to 'Contact'
     - Replaces empty values in 'Resolution' and contact columns with 'UNKNOWN'
     - Standardizes date columns and fills missing dates with '9999-12-31'
     - Renames columns by replacing spaces with underscores
     - Drops unwanted columns
     - Handles missing addresses and contacts
-    - Saves the modified data to a new file
     """
-    df = load_data(input_filepath)
     df = keep_columns_up_to_contact(df)
     df = handle_missing_address(df)  # Handle missing addresses
     df = handle_missing_contact(df)  # Handle missing contacts
@@ -70,13 +84,32 @@ def process_housing_data(input_filepath: str, output_filepath: str) -> None:
         df = handle_date_column(df, date_column)
     df = rename_columns(df)
     df = drop_unwanted_columns(df)
+    return df
+
+def process_housing_data(input_filepath: str, output_filepath: str, chunksize: int = None, backend: str = 'pandas',
+                         dtype: dict = None) -> None:
+    """
+    Main function to process housing court cases data and save it to a new file.
+    When `chunksize` is given, the next chunk is read and the previous chunk is written
+    on background threads while the current one is cleaned.
+    `dtype` sets column types to read, e.g. the common types of a multi-file drop.
+    """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_housing_court_cases(input_filepath, output_filepath, dtype)
+    df = load_data(input_filepath, chunksize, dtype)
+    if chunksize:
+        df = (clean_housing_data(chunk) for chunk in df)
+    else:
+        df = clean_housing_data(df)
     save_data(df, output_filepath)
 
 # Example function for use in a main script
-def run_housing_data_cleaning():
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Housing_Court_Cases.csv'  # Replace with actual input file path
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Housing_Court_Cases.csv'  # Replace with desired output file path
-    process_housing_data(input_filepath, output_filepath)
+def run_housing_data_cleaning(chunksize: int = None, backend: str = 'pandas'):
+    input_filepath = raw_path('Housing_Court_Cases.csv')
+    output_filepath = output_path(prod_path('Housing_Court_Cases.csv'))
+    run_stage(process_housing_data, input_filepath, output_filepath, chunksize=chunksize, backend=backend)
     print("Housing data cleaning completed successfully.")
 
 __all__ = [
@@ -89,6 +122,7 @@ __all__ = [
     'rename_columns',
     'drop_unwanted_columns',
     'save_data',
+    'clean_housing_data',
     'process_housing_data',
     'run_housing_data_cleaning'
 ]
@@ -1,8 +1,12 @@
 import pandas as pd
+from etl.common.data_profiler import profile_frame
+from etl.common.batch_ingest import run_stage
+from etl.common.compressed_io import output_path
+from etl.common.config import check_backend, raw_path, prod_path
 
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load a dataset from a CSV file."""
-    return pd.read_csv(filepath, low_memory=False)
+def load_data(filepath: str, dtype: dict = None) -> pd.DataFrame:
+    """Load a dataset from a CSV file, reading the columns in `dtype` with the given types."""
+    return pd.read_csv(filepath, low_memory=False, dtype=dtype)
 
 def rename_columns(df: pd.DataFrame, columns_map: dict) -> pd.DataFrame:
     """Rename specified columns in the DataFrame."""
@@ -14,10 +18,7 @@ def filter_columns(df: pd.DataFrame, columns_to_keep: list) -> pd.DataFrame:
 
 def fill_null_values(df: pd.DataFrame, fill_values: dict) -> pd.DataFrame:
     """Fill null or empty values in specified columns with provided defaults."""
-    for col, value in fill_values.items():
-        if col in df.columns:
-            df[col].fillna(value, inplace=True)
-    return df
+    return df.fillna({col: value for col, value in fill_values.items() if col in df.columns})
 
 def clean_local_assessment(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -53,15 +54,21 @@ def merge_and_filter_data(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
     filtered_df = merged_df[merged_df['RollYear'] == 2023]
     return filtered_df
 
-def process_assessment_data(input_filepath: str, stage_filepath: str, output_filepath: str) -> None:
+def process_assessment_data(input_filepath: str, stage_filepath: str, output_filepath: str, backend: str = 'pandas',
+                            dtype: dict = None) -> None:
     """
     Main function to process assessment data:
     - Load and clean local assessment data
     - Merge with updated data and filter by RollYear
     - Save the final merged and filtered dataset
+    `dtype` sets column types to read from `input_filepath`, e.g. the common types of a multi-file drop.
     """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_local_assessment(input_filepath, stage_filepath, output_filepath, dtype)
     # Load and clean local assessment data
-    df = load_data(input_filepath)
+    df = load_data(input_filepath, dtype)
     df = clean_local_assessment(df)
     #df.to_csv(updated_filepath, index=False)
 
@@ -73,13 +80,14 @@ def process_assessment_data(input_filepath: str, stage_filepath: str, output_fil
     final_df = merge_and_filter_data(df, df2)
     
     # Save the final merged and filtered dataset
+    profile_frame(final_df, output_filepath)
     final_df.to_csv(output_filepath, index=False)
     print(f"Data processing completed and saved as '{output_filepath}'.")
 
 
-def run_local_assessment_cleaning():
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Local_Assessment.csv'  # Replace with your actual input file path
-    stage_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Assessment.csv'
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Assessment_with_Local.csv'  # Replace with your desired output file path
-    process_assessment_data(input_filepath, stage_filepath, output_filepath)
+def run_local_assessment_cleaning(backend: str = 'pandas'):
+    input_filepath = raw_path('Local_Assessment.csv')
+    stage_filepath = output_path(prod_path('Assessment.csv'))
+    output_filepath = output_path(prod_path('Assessment_with_Local.csv'))
+    run_stage(process_assessment_data, input_filepath, output_filepath, stage_filepath, backend=backend)
     print("Local Assessment data cleaning completed successfully.")
\ No newline at end of file
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import sqlite3
+import pandas as pd
+from etl.common.compressed_io import input_path
+from etl.common.config import PROD_FILE_PATH
+
+PROPERTY_STORE_PATH = os.getenv('PROPERTY_STORE_PATH', os.path.join(os.path.dirname(PROD_FILE_PATH), 'Property_Lookup.db'))
+
+# Prod table -> column holding the parcel's Print_Key/SBL (None for tables not keyed by parcel)
+PROD_TABLES = {
+    'Assessment': 'Print_Key',
+    'Assessment_with_Local': 'PrintKey',
+    'Housing_Violations': 'Print_Key',
+    'Code_Violations': 'SBL',
+    'Bank_Code_Identifier': None,
+}
+
+KEY_COLUMN = '_print_key'
+CHUNKSIZE = 100_000
+
+
+def normalize_print_key(value):
+    """
+    Normalizes a Print_Key/SBL so the same parcel matches across sources.
+
+    Parameters:
+    - value (str): Raw key, e.g. ' 100.34-4-23 '.
+
+    Returns:
+    - str: Upper-cased key with surrounding and inner whitespace removed.
+    """
+    if value is None or (isinstance(value, float) and pd.isnull(value)):
+        return None
+    return ''.join(str(value).split()).upper()
+
+
+def _source_signature(filepath):
+    stat = os.stat(filepath)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _load_table(conn, table_name, filepath, key_column):
+    """Replaces a store table with the contents of a prod file, adding an indexed normalized key."""
+    conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+    for chunk in pd.read_csv(filepath, dtype=str, chunksize=CHUNKSIZE):
+        if key_column:
+            chunk[KEY_COLUMN] = chunk[key_column].map(normalize_print_key)
+        chunk.to_sql(table_name, conn, if_exists='append', index=False)
+    if key_column:
+        conn.execute(f'CREATE INDEX "idx_{table_name}_key" ON "{table_name}" ("{KEY_COLUMN}")')
+    if table_name == 'Bank_Code_Identifier':
+        conn.execute(f'CREATE INDEX "idx_{table_name}_code" ON "{table_name}" ("BANK_CODE")')
+
+
+def build_property_store(prod_dir=PROD_FILE_PATH, store_path=PROPERTY_STORE_PATH):
+    """
+    Builds or refreshes the local property lookup store from the prod outputs.
+
+    Only tables whose prod file changed (size or modification time) since the last build are reloaded.
+
+    Parameters:
+    - prod_dir (str): Folder containing the prod CSV files.
+    - store_path (str): Path to the SQLite store.
+
+    Returns:
+    - list: Names of the tables that were (re)loaded.
+    """
+    conn = sqlite3.connect(store_path)
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS _sources (table_name TEXT PRIMARY KEY, filepath TEXT, signature TEXT)")
+        loaded = []
+        for table_name, key_column in PROD_TABLES.items():
+            filepath = input_path(os.path.join(prod_dir, f"{table_name}.csv"))
+            if not os.path.exists(filepath):
+                print(f"Skipping '{table_name}': {filepath} not found.")
+                continue
+            signature = _source_signature(filepath)
+            row = conn.execute("SELECT filepath, signature FROM _sources WHERE table_name = ?", (table_name,)).fetchone()
+            if row == (filepath, signature):
+                continue
+            print(f"Loading '{table_name}' from {filepath}...")
+            with conn:
+                _load_table(conn, table_name, filepath, key_column)
+                conn.execute("INSERT OR REPLACE INTO _sources VALUES (?, ?, ?)", (table_name, filepath, signature))
+            loaded.append(table_name)
+        print(f"Property store at {store_path} is up to date ({len(loaded)} table(s) reloaded).")
+        return loaded
+    finally:
+        conn.close()
+
+
+def _rows(conn, table_name, where, params):
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)).fetchone()
+    if not exists:
+        return []
+    cursor = conn.execute(f'SELECT * FROM "{table_name}" WHERE {where}', params)
+    columns = [description[0] for description in cursor.description]
+    return [{col: value for col, value in zip(columns, row) if col != KEY_COLUMN} for row in cursor.fetchall()]
+
+
+def lookup_parcel(print_key, store_path=PROPERTY_STORE_PATH):
+    """
+    Returns everything the store holds about one parcel.
+
+    Parameters:
+    - print_key (str): The parcel's Print_Key/SBL, in any spacing or case.
+    - store_path (str): Path to the SQLite store.
+
+    Returns:
+    - dict: 'assessment', 'local_assessment', 'historic', 'housing_violations', 'code_violations' and 'bank'.
+    """
+    key = normalize_print_key(print_key)
+    conn = sqlite3.connect(f"file:{store_path}?mode=ro", uri=True)
+    try:
+        by_key = f'"{KEY_COLUMN}" = ?'
+        assessment = _rows(conn, 'Assessment', by_key, (key,))
+        local_assessment = _rows(conn, 'Assessment_with_Local', by_key, (key,))
+        bank_codes = sorted({row['Bank'] for row in local_assessment if row.get('Bank') not in (None, 'UNKNOWN')})
+        bank = []
+        if bank_codes:
+            placeholders = ', '.join('?' * len(bank_codes))
+            bank = _rows(conn, 'Bank_Code_Identifier', f'"BANK_CODE" IN ({placeholders})', bank_codes)
+        return {
+            'print_key': key,
+            'assessment': assessment,
+            'local_assessment': local_assessment,
+            'historic': [
+                {'Historic_Property': row.get('Historic_Property'), 'Historic_District_Name': row.get('Historic_District_Name')}
+                for row in assessment
+            ],
+            'housing_violations': _rows(conn, 'Housing_Violations', by_key, (key,)),
+            'code_violations': _rows(conn, 'Code_Violations', by_key, (key,)),
+            'bank': bank,
+        }
+    finally:
+        conn.close()
+
+
+def run_property_store_build():
+    build_property_store()
+    print("Property lookup store build completed successfully.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the local property lookup store.")
+    parser.add_argument('--store', default=PROPERTY_STORE_PATH, help="Path to the SQLite store.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Build or refresh the store from the prod outputs.")
+    build_parser.add_argument('--prod-dir', default=PROD_FILE_PATH, help="Folder containing the prod CSV files.")
+    lookup_parser = subparsers.add_parser('lookup', help="Print everything known about a parcel as JSON.")
+    lookup_parser.add_argument('print_key', help="Print_Key/SBL of the parcel, e.g. 100.34-4-23.")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        build_property_store(args.prod_dir, args.store)
+    else:
+        print(json.dumps(lookup_parcel(args.print_key, args.store), indent=2))
+
+
+if __name__ == "__main__":
+    main()
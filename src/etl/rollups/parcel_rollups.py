@@ -0,0 +1,290 @@
+import argparse
+import hashlib
+import inspect
+import os
+import pickle
+import pandas as pd
+from etl.common.compressed_io import input_path, output_path, remove_other_variants
+from etl.common.config import PROD_FILE_PATH
+from etl.common.data_profiler import profile_frame
+from etl.property_lookup.property_store import normalize_print_key
+
+ROLLUP_STATE_PATH = os.getenv('ROLLUP_STATE_PATH', os.path.join(os.path.dirname(PROD_FILE_PATH), 'Rollup_State.pkl'))
+
+# Filler the cleaners put in date columns that are empty, i.e. a violation that is not closed yet
+OPEN_DATE_FILLER = '9999-12-31'
+
+# Fillers the cleaners and the parcel linking put in place of a missing or unmatched parcel key
+MISSING_PRINT_KEYS = {'', 'UNKNOWN', 'N/A', '-1'}
+
+
+def _parcel_keys(values):
+    """Normalizes parcel keys, turning the missing-key fillers into None so those rows are left out of the rollups."""
+    keys = values.map(normalize_print_key)
+    return keys.where(~keys.isin(MISSING_PRINT_KEYS), None)
+
+
+def _housing_violation_counts(df):
+    return pd.DataFrame({
+        'Print_Key': _parcel_keys(df['Print_Key']),
+        'Housing_Violations': 1,
+        'Open_Housing_Violations': (df['Closed_Date'].astype(str) == OPEN_DATE_FILLER).astype(int),
+    })
+
+
+def _code_violation_counts(df):
+    return pd.DataFrame({'Print_Key': _parcel_keys(df['SBL']), 'Code_Violations': 1})
+
+
+def _court_case_counts(df):
+    return pd.DataFrame({
+        'Print_Key': _parcel_keys(df['Print_Key']),
+        'Status': df['Status'].astype(str).str.upper(),
+        'Court_Cases': 1,
+        'Open_Court_Cases': (df['Status'].astype(str).str.upper() == 'OPEN').astype(int),
+    })
+
+
+# Prod table -> (columns read, function turning those rows into per-row rollup contributions)
+ROLLUP_SOURCES = {
+    'Housing_Violations': (['Print_Key', 'Closed_Date'], _housing_violation_counts),
+    'Code_Violations': (['SBL'], _code_violation_counts),
+    'Housing_Court_Cases': (['Print_Key', 'Status'], _court_case_counts),
+}
+
+# Per-parcel rollup -> (key columns, measure columns)
+PARCEL_ROLLUPS = {
+    'Parcel_Rollup': (
+        ['Print_Key'],
+        ['Housing_Violations', 'Open_Housing_Violations', 'Code_Violations', 'Court_Cases', 'Open_Court_Cases'],
+    ),
+    'Parcel_Court_Case_Status_Rollup': (['Print_Key', 'Status'], ['Court_Cases']),
+}
+
+# Per-district rollup -> the per-parcel rollup it is aggregated from
+DISTRICT_ROLLUPS = {
+    'Historic_District_Rollup': 'Parcel_Rollup',
+    'Historic_District_Court_Case_Status_Rollup': 'Parcel_Court_Case_Status_Rollup',
+}
+
+
+def _source_signature(filepath):
+    stat = os.stat(filepath)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def rollup_logic_signature():
+    """
+    Hashes what decides the rollup contribution of a row: the source columns and contribution
+    functions, the missing-key fillers and the rollup layouts. A state saved under another
+    signature no longer matches the code, so it is discarded and the rollups are rebuilt.
+    """
+    parts = [repr(sorted(MISSING_PRINT_KEYS)), OPEN_DATE_FILLER, repr(PARCEL_ROLLUPS)]
+    for source, (columns, contribute) in ROLLUP_SOURCES.items():
+        parts += [source, repr(columns), inspect.getsource(contribute)]
+    parts += [inspect.getsource(_parcel_keys), inspect.getsource(normalize_print_key)]
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+
+def _empty_rollup(keys, measures):
+    return pd.DataFrame({column: pd.Series(dtype='int64') for column in keys + measures}).set_index(keys)
+
+
+def load_rollup_state(state_path=ROLLUP_STATE_PATH):
+    """
+    Loads what the previous build left behind: per source, its file signature and the rollup
+    contribution of every distinct row (keyed by row hash, with a 'Rows' count for duplicates),
+    and the current per-parcel rollups. Returns an empty state when there is none, or when it was
+    built with other contribution logic (see `rollup_logic_signature`).
+    """
+    logic = rollup_logic_signature()
+    if state_path and os.path.exists(state_path):
+        with open(state_path, 'rb') as file:
+            state = pickle.load(file)
+        if state.get('logic') == logic:
+            return state
+        print(f"The rollup logic changed since {state_path} was saved; rebuilding the rollups from scratch.")
+    return {
+        'logic': logic,
+        'sources': {},
+        'rollups': {name: _empty_rollup(keys, measures) for name, (keys, measures) in PARCEL_ROLLUPS.items()},
+    }
+
+
+def save_rollup_state(state, state_path=ROLLUP_STATE_PATH):
+    """Writes the state to a temporary file first so an interrupted build never leaves it half-written."""
+    temporary_path = state_path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, state_path)
+
+
+def source_delta(df, contribute, previous_rows=None):
+    """
+    Works out which rows of a source were added or removed since the previous build.
+
+    Rows are identified by a hash of the columns the rollups use, so edits to other columns
+    do not count as changes. Only rows never seen before are turned into contributions.
+
+    Parameters:
+    - df (pd.DataFrame): Current contents of the source (the columns listed in ROLLUP_SOURCES).
+    - contribute (callable): Turns rows into per-row contributions (key and measure columns).
+    - previous_rows (pd.DataFrame): Contributions from the previous build, indexed by row hash, with 'Rows'.
+
+    Returns:
+    - tuple: (delta, rows) where `delta` holds the contributions to add (negative for removed rows)
+      and `rows` replaces `previous_rows` in the state.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    counts = hashes.value_counts()
+    if previous_rows is None:
+        previous_rows = contribute(df.iloc[:0]).assign(Rows=0)
+    row_delta = counts.sub(previous_rows['Rows'], fill_value=0).astype('int64')
+    row_delta = row_delta[row_delta != 0]
+
+    unseen = ~hashes.isin(previous_rows.index) & ~hashes.duplicated()
+    new_rows = contribute(df[unseen.to_numpy()])
+    new_rows.index = hashes[unseen].to_numpy()
+    known_rows = previous_rows.drop(columns='Rows')
+    known_rows = pd.concat([frame for frame in [known_rows, new_rows] if not frame.empty] or [new_rows])
+
+    delta = known_rows.loc[row_delta.index]
+    measures = delta.select_dtypes(include='number').columns
+    delta[measures] = delta[measures].mul(row_delta, axis=0)
+
+    rows = known_rows.loc[counts.index]
+    rows['Rows'] = counts
+    return delta, rows
+
+
+def apply_delta(rollup, delta, keys, measures):
+    """
+    Adds a source's contribution delta to a per-parcel rollup, dropping groups that fall to zero.
+    Rows without a parcel key (None) are left out.
+
+    Parameters:
+    - rollup (pd.DataFrame): Current rollup indexed by `keys`.
+    - delta (pd.DataFrame): Output of `source_delta`.
+    - keys (list): Key columns of the rollup.
+    - measures (list): Measure columns of the rollup.
+
+    Returns:
+    - pd.DataFrame: The updated rollup.
+    """
+    present = [measure for measure in measures if measure in delta.columns]
+    if not present or not set(keys) <= set(delta.columns) or delta.empty:
+        return rollup
+    change = delta.groupby(keys)[present].sum()
+    rollup = rollup.add(change, fill_value=0).reindex(columns=measures).fillna(0).astype('int64')
+    return rollup[(rollup != 0).any(axis=1)]
+
+
+def district_map(assessment_filepath):
+    """Returns the historic district of each parcel from the prod assessment data (historic parcels only)."""
+    assessment_df = pd.read_csv(assessment_filepath, usecols=['Print_Key', 'Historic_District_Name'], dtype=str)
+    assessment_df = assessment_df[assessment_df['Historic_District_Name'].notna()
+                                  & (assessment_df['Historic_District_Name'] != 'UNKNOWN')]
+    assessment_df = assessment_df.assign(Print_Key=assessment_df['Print_Key'].map(normalize_print_key))
+    return assessment_df.drop_duplicates(subset='Print_Key')
+
+
+def district_rollup(parcel_rollup, districts):
+    """
+    Aggregates a per-parcel rollup to historic districts.
+
+    This works from the per-parcel rollup rather than the detail tables, so it stays cheap
+    enough to redo on every build.
+    """
+    rollup = parcel_rollup.reset_index().merge(districts, on='Print_Key', how='inner')
+    keys = ['Historic_District_Name'] + [key for key in parcel_rollup.index.names if key != 'Print_Key']
+    rollup = rollup.drop(columns='Print_Key').groupby(keys).sum()
+    if keys == ['Historic_District_Name']:
+        parcels = districts.groupby('Historic_District_Name').size().rename('Parcels')
+        rollup = rollup.reindex(parcels.index, fill_value=0)
+        rollup.insert(0, 'Parcels', parcels)
+    return rollup
+
+
+def build_rollups(prod_dir=PROD_FILE_PATH, state_path=ROLLUP_STATE_PATH, full=False):
+    """
+    Builds or updates the per-parcel and per-historic-district rollup tables in the prod folder.
+
+    Sources whose prod file did not change since the last build are skipped. For the others,
+    only the rows added or removed since then are applied to the rollups, so a new monthly
+    slice costs about as much as the slice itself.
+
+    Parameters:
+    - prod_dir (str): Folder containing the prod CSV files; the rollups are written there too.
+    - state_path (str): Where the build state is kept between runs.
+    - full (bool): Ignore the saved state and rebuild from scratch.
+
+    Returns:
+    - list: Names of the sources that were (re)applied.
+    """
+    state = load_rollup_state(None if full else state_path)
+    applied = []
+    for source, (columns, contribute) in ROLLUP_SOURCES.items():
+        filepath = input_path(os.path.join(prod_dir, f"{source}.csv"))
+        if not os.path.exists(filepath):
+            print(f"Skipping '{source}': {filepath} not found.")
+            continue
+        signature = _source_signature(filepath)
+        previous = state['sources'].get(source)
+        if previous is not None and previous['signature'] == signature:
+            continue
+
+        df = pd.read_csv(filepath, usecols=columns, dtype=str, keep_default_na=False)
+        delta, rows = source_delta(df, contribute, previous['rows'] if previous else None)
+        for name, (keys, measures) in PARCEL_ROLLUPS.items():
+            state['rollups'][name] = apply_delta(state['rollups'][name], delta, keys, measures)
+        state['sources'][source] = {'signature': signature, 'rows': rows}
+        applied.append(source)
+        print(f"Applied {len(delta)} changed row group(s) from '{source}'.")
+        unmatched = rows.loc[rows['Print_Key'].isna(), 'Rows'].sum()
+        if unmatched:
+            print(f"Left {unmatched} row(s) without a parcel key out of the rollups from '{source}'.")
+
+    if applied:
+        for name, rollup in state['rollups'].items():
+            write_rollup(rollup, os.path.join(prod_dir, f"{name}.csv"))
+
+    # District rollups are redone when a parcel rollup or the parcels' districts changed
+    assessment_filepath = input_path(os.path.join(prod_dir, 'Assessment.csv'))
+    if os.path.exists(assessment_filepath):
+        signature = _source_signature(assessment_filepath)
+        if applied or state.get('districts_signature') != signature:
+            districts = district_map(assessment_filepath)
+            for name, parcel_rollup in DISTRICT_ROLLUPS.items():
+                write_rollup(district_rollup(state['rollups'][parcel_rollup], districts), os.path.join(prod_dir, f"{name}.csv"))
+            state['districts_signature'] = signature
+
+    save_rollup_state(state, state_path)
+    print(f"Rollups in {prod_dir} are up to date ({len(applied)} source(s) applied).")
+    return applied
+
+
+def write_rollup(rollup, filepath):
+    """Saves a rollup table (sorted by its keys) to the prod folder."""
+    filepath = output_path(filepath)
+    rollup = rollup.sort_index().reset_index()
+    profile_frame(rollup, filepath)
+    rollup.to_csv(filepath, index=False)
+    remove_other_variants(filepath)
+
+
+def run_rollup_build():
+    build_rollups()
+    print("Parcel and historic district rollups completed successfully.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or incrementally update the per-parcel and per-district rollups.")
+    parser.add_argument('--prod-dir', default=PROD_FILE_PATH, help="Folder containing the prod CSV files.")
+    parser.add_argument('--state', default=ROLLUP_STATE_PATH, help="Path to the rollup build state.")
+    parser.add_argument('--full', action='store_true', help="Ignore the saved state and rebuild from scratch.")
+    args = parser.parse_args(argv)
+    build_rollups(args.prod_dir, args.state, args.full)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,28 @@
 import pandas as pd
 import re
+from etl.common.data_profiler import profile_chunks, profile_frame
+from etl.common.pipelined_io import read_csv_prefetched, write_csv_behind
+from etl.common.batch_ingest import run_stage
+from etl.common.compressed_io import output_path
+from etl.common.config import check_backend, raw_path, prod_path
 
-# Load dataset
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load dataset from a CSV file, suppressing dtype warnings by setting low_memory=False."""
-    return pd.read_csv(filepath, low_memory=False)
+# Text columns of the 311 housing violations file that the cleaning keeps. They are always read
+# as text, so one that happens to be empty in a chunk (or a whole file of a multi-file drop) is
+# not read as float64 and still gets its blanks filled with "UNKNOWN".
+TEXT_COLUMNS = ['Status', 'Subject', 'Reason', 'Type', 'Object Type', 'Source', 'Description']
 
+# Load dataset
+def load_data(filepath: str, chunksize: int = None, dtype: dict = None):
+    """
+    Load dataset from a CSV file, suppressing dtype warnings by setting low_memory=False.
+    When `chunksize` is given, returns an iterator of chunks prefetched on a background thread.
+    The TEXT_COLUMNS present in the file are read as text in either case, on top of `dtype`.
+    """
+    header = pd.read_csv(filepath, nrows=0).columns
+    dtype = {**(dtype or {}), **{col: object for col in TEXT_COLUMNS if col in header}}
+    if chunksize:
+        return read_csv_prefetched(filepath, chunksize, low_memory=False, dtype=dtype)
+    return pd.read_csv(filepath, low_memory=False, dtype=dtype)
 
 # Drop unnecessary columns
 def drop_columns(df: pd.DataFrame, columns_to_drop: list) -> pd.DataFrame:
@@ -37,8 +54,7 @@ def format_date_columns(df: pd.DataFrame, date_columns: list, filler_date: str =
     """Convert date columns to 'YYYY-MM-DD' format and fill missing dates with a default value."""
     for col in date_columns:
         if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce').dt.strftime('%Y-%m-%d')
-            df[col].fillna(filler_date, inplace=True)
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.strftime('%Y-%m-%d').fillna(filler_date)
     return df
 
 # Replace spaces in column headers with underscores
@@ -55,15 +71,22 @@ def fill_missing_text_values(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 # Save cleaned dataset
-def save_data(df: pd.DataFrame, output_filepath: str) -> None:
-    """Save the modified dataframe to a new CSV file."""
-    df.to_csv(output_filepath, index=False)
+def save_data(df, output_filepath: str) -> None:
+    """
+    Save the modified dataframe to a new CSV file.
+    Also accepts an iterable of chunks, which are written on a background thread as they arrive.
+    """
+    if isinstance(df, pd.DataFrame):
+        profile_frame(df, output_filepath)
+        df.to_csv(output_filepath, index=False)
+    else:
+        write_csv_behind(profile_chunks(df, output_filepath), output_filepath)
     print(f"Data saved to {output_filepath}")
 
-# Main cleaning function
-def process_housing_data(input_filepath: str, output_filepath: str) -> None:
+# Clean a single frame or chunk
+def clean_housing_data(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Main function to clean the housing violations dataset.
+    Apply the housing violations cleaning steps to a dataframe.
     - Drops unnecessary columns
     - Removes specific text from 'Type' column
     - Renames columns
@@ -80,10 +103,6 @@ def process_housing_data(input_filepath: str, output_filepath: str) -> None:
     columns_to_rename = {'Property ID': 'Print Key'}
     date_columns = ['Open Date', 'Closed Date']
 
-    # Load data
-    df = load_data(input_filepath)
-    
-    # Clean data
     df = drop_columns(df, columns_to_drop)
     df = remove_text_from_column(df, 'Type', r'\(Req_Serv\)')
     df = rename_columns(df, columns_to_rename)
@@ -91,14 +110,37 @@ def process_housing_data(input_filepath: str, output_filepath: str) -> None:
     df = format_date_columns(df, date_columns)
     df = standardize_column_names(df)
     df = fill_missing_text_values(df)
+    return df
+
+# Main cleaning function
+def process_housing_data(input_filepath: str, output_filepath: str, chunksize: int = None, backend: str = 'pandas',
+                         dtype: dict = None) -> None:
+    """
+    Main function to clean the housing violations dataset.
+    When `chunksize` is given, the file is processed as a pipeline: the next chunk is read
+    and the previous chunk is written on background threads while the current one is cleaned.
+    `dtype` sets column types to read, e.g. the common types of a multi-file drop.
+    """
+    check_backend(backend)
+    if backend == 'polars':
+        from etl.common import polars_backend
+        return polars_backend.process_housing_violations(input_filepath, output_filepath, dtype)
+    # Load data
+    df = load_data(input_filepath, chunksize, dtype)
+
+    # Clean data
+    if chunksize:
+        df = (clean_housing_data(chunk) for chunk in df)
+    else:
+        df = clean_housing_data(df)
 
     # Save cleaned data
     save_data(df, output_filepath)
 
 
 # Example function for use in a main script
-def run_housing_data_cleaning():
-    input_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/raw/Housing_Violations.csv'  # Replace with your actual input file path
-    output_filepath = '/Users/chiragkhachane/Projects/Third_Estate/src/data/prod/Housing_Violations.csv'  # Replace with your desired output file path
-    process_housing_data(input_filepath, output_filepath)
+def run_housing_data_cleaning(chunksize: int = None, backend: str = 'pandas'):
+    input_filepath = raw_path('Housing_Violations.csv')
+    output_filepath = output_path(prod_path('Housing_Violations.csv'))
+    run_stage(process_housing_data, input_filepath, output_filepath, chunksize=chunksize, backend=backend)
     print("Data 311 housing violations cleaning completed successfully.")
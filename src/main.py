@@ -1,68 +1,122 @@
-from etl.assessment import csv_header_transformer, historic_setter, null_replacer, historic_district_name_setter
-from etl.code_violations import  code_violations_cleaner
-from etl.violations import violations_cleaner
-from etl.housing_court_cases import housing_court_case_cleaner
-from etl.local_assessment import local_assessmnet_cleaner
-from etl.data_upload import data_upload
-from etl.bank import bank_cleaner
+import argparse
+import os
 
+# Cleaning backend for this run: 'pandas' (default) or 'polars' (requires the polars package)
+ETL_BACKEND = os.getenv('ETL_BACKEND', 'pandas')
 
-def run_assessment_cleaner():
-    csv_header_transformer.process_csv_headers()
-    null_replacer.run_csv_data_cleaning()
-    historic_setter.run_assessment_data_cleaning()
-    historic_district_name_setter.run_assessment_data_cleaning()
+# Rows per chunk for the cleaners that can stream (violations, housing court cases); 0 reads whole files
+ETL_CHUNKSIZE = int(os.getenv('ETL_CHUNKSIZE', '0')) or None
 
-def run_code_violations_cleaner():
-    code_violations_cleaner.run_code_violations_cleaning()
+# Each runner imports its ETL modules when called, so only the stages being run are loaded.
 
-def run_violations_cleaner():
-    violations_cleaner.run_housing_data_cleaning()
+def run_assessment_cleaner(backend=ETL_BACKEND):
+    from etl.assessment import csv_header_transformer, historic_setter, null_replacer, historic_district_name_setter
+    csv_header_transformer.process_csv_headers(backend=backend)
+    null_replacer.run_csv_data_cleaning(backend=backend)
+    historic_setter.run_assessment_data_cleaning(backend=backend)
+    historic_district_name_setter.run_assessment_data_cleaning(backend=backend)
 
-def run_housing_court_case_cleaner():
-    housing_court_case_cleaner.run_housing_data_cleaning()
+def run_code_violations_cleaner(backend=ETL_BACKEND):
+    from etl.code_violations import code_violations_cleaner
+    code_violations_cleaner.run_code_violations_cleaning(backend=backend)
 
-def run_local_assessment_cleaner():
-    local_assessmnet_cleaner.run_local_assessment_cleaning()
+def run_violations_cleaner(backend=ETL_BACKEND):
+    from etl.violations import violations_cleaner
+    violations_cleaner.run_housing_data_cleaning(chunksize=ETL_CHUNKSIZE, backend=backend)
 
-def run_bank_data_cleaning():
-    bank_cleaner.run_bank_data_cleaning()
+def run_housing_court_case_cleaner(backend=ETL_BACKEND):
+    from etl.housing_court_cases import housing_court_case_cleaner, address_matcher
+    housing_court_case_cleaner.run_housing_data_cleaning(chunksize=ETL_CHUNKSIZE, backend=backend)
+    address_matcher.run_court_case_parcel_linking()
+
+def run_local_assessment_cleaner(backend=ETL_BACKEND):
+    from etl.local_assessment import local_assessmnet_cleaner
+    local_assessmnet_cleaner.run_local_assessment_cleaning(backend=backend)
+
+def run_bank_data_cleaning(backend=ETL_BACKEND):
+    from etl.bank import bank_cleaner
+    bank_cleaner.run_bank_data_cleaning(backend=backend)
+
+def run_rollup_build():
+    from etl.rollups import parcel_rollups
+    parcel_rollups.run_rollup_build()
+
+def run_property_store_build():
+    from etl.property_lookup import property_store
+    property_store.run_property_store_build()
 
 def run_data_upload_snowflake():
+    from etl.data_upload import data_upload
+    print("Startig data upload to Snowflake...")
     data_upload.run_data_upload_pipeline()
 
-def main():
-    """
-    Main function to process a CSV file in a data pipeline:
-    1. Reads input file path and output file path from a configuration or predefined setup.
-    2. Transforms headers according to specified rules.
-    3. Outputs the final processed file.
-    """
-    
+
+# Stage name -> runner, in pipeline order
+STAGES = {
     # Step 1: Transform and clean Assessment data
-    run_assessment_cleaner()
-    
+    'assessment': run_assessment_cleaner,
     # Step 2: Clean Code Violations data
-    run_code_violations_cleaner()
-
+    'code_violations': run_code_violations_cleaner,
     # Step 3: Clean Violations data
-    run_violations_cleaner()
-
-    # Step 4: Clean Housing Court Cases data
-    run_housing_court_case_cleaner()
-
+    'violations': run_violations_cleaner,
+    # Step 4: Clean Housing Court Cases data and link them to parcels
+    'housing_court_cases': run_housing_court_case_cleaner,
     # Step 5: Clean Local_Assessment data
-    run_local_assessment_cleaner()
-    
+    'local_assessment': run_local_assessment_cleaner,
     # Step 6: Clean Bank Data
-    run_bank_data_cleaning()
-    
-    print("Data cleaning and transformation 100'%' complete.")
+    'bank': run_bank_data_cleaning,
+    # Step 7: Update the per-parcel and per-historic-district rollups
+    'rollups': run_rollup_build,
+    # Step 8: Refresh the local property lookup store from the prod outputs
+    'property_store': run_property_store_build,
+    # Step 9: Upload cleaned data to Snowflake
+    'upload': run_data_upload_snowflake,
+}
 
-    # Step 7: Upload cleaned data to Snowflake
-    print("Startig data upload to Snowflake...")
-    run_data_upload_snowflake()
+
+def select_stages(only=None, start=None):
+    """
+    Picks the stages to run, in pipeline order.
+
+    Parameters:
+    - only (list): Run just these stages.
+    - start (str): Run this stage and every stage after it.
+
+    Returns:
+    - list: Stage names; every stage when neither option is given.
+    """
+    names = list(STAGES)
+    if only:
+        return [name for name in names if name in only]
+    if start:
+        return names[names.index(start):]
+    return names
+
+
+def main(argv=None):
+    """
+    Runs the data pipeline, or the stages selected on the command line:
+    - Cleans each source from the raw folder into the stage and prod folders (paths from RAW_FILE_PATH,
+      STAGE_FILE_PATH and PROD_FILE_PATH).
+    - Builds the rollups and the property lookup store from the prod outputs.
+    - Uploads the cleaned data to Snowflake.
+    """
+    parser = argparse.ArgumentParser(description="Run the data pipeline, or selected stages of it.")
+    stage_selection = parser.add_mutually_exclusive_group()
+    stage_selection.add_argument('--only', action='append', choices=list(STAGES), metavar='STAGE',
+                                 help="Run only this stage; repeat for several. Stages: " + ", ".join(STAGES))
+    stage_selection.add_argument('--from', dest='start', choices=list(STAGES), metavar='STAGE',
+                                 help="Run this stage and every stage after it.")
+    args = parser.parse_args(argv)
+
+    from etl.common.memory_audit import enable_copy_on_write
+    # Column selections, renames and drops in the cleaners share data instead of copying it
+    enable_copy_on_write()
+
+    for name in select_stages(args.only, args.start):
+        print(f"Running stage '{name}'...")
+        STAGES[name]()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
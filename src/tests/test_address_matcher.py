@@ -0,0 +1,38 @@
+import pandas as pd
+
+from etl.housing_court_cases import address_matcher
+
+
+def test_position_words_are_kept_in_street_names():
+    normalized = address_matcher.normalize_addresses(pd.Series([
+        '45 FRONT AVE', '45 Front Avenue Rear', '10 LOWER TERRACE', '12 MAIN ST UPPER', '12 ELM FL 2', '100 MAIN ST APT 3',
+    ]))
+    assert normalized['Street'].tolist() == ['FRONT AVE', 'FRONT AVE', 'LOWER TER', 'MAIN ST', 'ELM', 'MAIN ST']
+
+
+def test_front_avenue_links_to_its_parcel():
+    parcel_index = address_matcher.build_parcel_index(pd.DataFrame({
+        'Print_Key': ['111.1-1-1', '222.2-2-2'], 'Address': ['45 FRONT AVE', '12 MAIN ST'],
+    }))
+    matches = address_matcher.match_addresses(pd.Series(['45 FRONT AVENUE', '45 FRONT AVE REAR', '12 MAIN ST UPPER']), parcel_index)
+    assert matches['Print_Key'].tolist() == ['111.1-1-1', '111.1-1-1', '222.2-2-2']
+    assert matches['Match_Confidence'].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_street_base_only_fills_in_missing_parts():
+    parcel_index = address_matcher.build_parcel_index(pd.DataFrame({
+        'Print_Key': ['111.1-1-1', '222.2-2-2', '333.3-3-3'], 'Address': ['12 S MAIN ST', '30 ELM AVE', '676 RILEY ST'],
+    }))
+    matches = address_matcher.match_addresses(pd.Series([
+        '12 N MAIN ST', '30 ELM ST', '12 MAIN AVE', '676 RILEY', '12 MAIN', '30 ELM',
+    ]), parcel_index)
+    assert matches['Print_Key'].tolist() == ['UNKNOWN', 'UNKNOWN', 'UNKNOWN', '333.3-3-3', '111.1-1-1', '222.2-2-2']
+    assert matches['Match_Confidence'].tolist() == [0.0, 0.0, 0.0, 0.9, 0.9, 0.9]
+
+
+def test_fuzzy_match_respects_suffixes():
+    parcel_index = address_matcher.build_parcel_index(pd.DataFrame({
+        'Print_Key': ['222.2-2-2'], 'Address': ['30 ELM AVE'],
+    }))
+    matches = address_matcher.match_addresses(pd.Series(['30 ELMM AVE', '30 ELMM ST']), parcel_index)
+    assert matches['Print_Key'].tolist() == ['222.2-2-2', 'UNKNOWN']
@@ -0,0 +1,76 @@
+import json
+import os
+import pandas as pd
+import pytest
+
+from etl.common import batch_ingest, memory_audit
+from etl.common.data_profiler import profile_frame, profile_path
+from etl.violations import violations_cleaner
+
+
+def copy_rows(input_filepath, output_filepath):
+    df = pd.read_csv(input_filepath)
+    profile_frame(df, output_filepath)
+    df.to_csv(output_filepath, index=False)
+
+
+def record_copy_on_write(input_filepath, output_filepath):
+    pd.DataFrame({'Copy_On_Write': [memory_audit.copy_on_write_enabled()]}).to_csv(output_filepath, index=False)
+
+
+@pytest.fixture
+def drop(tmp_path):
+    folder = tmp_path / 'Code_Violations'
+    folder.mkdir()
+    for month, keys in [('01', ['1.1-1-1', None]), ('02', ['2.2-2-2', '3.3-3-3'])]:
+        pd.DataFrame({'SBL': keys}).to_csv(folder / f'Code_Violations_2024-{month}.csv', index=False)
+    return str(folder)
+
+
+def test_multi_file_drop_profiles_combined_output(drop, tmp_path):
+    output = str(tmp_path / 'Code_Violations.csv.gz')
+    batch_ingest.run_stage(copy_rows, drop, output, max_workers=2)
+
+    assert not os.path.exists(batch_ingest.partition_dir(output))
+    with open(profile_path(output)) as file:
+        profile = json.load(file)
+    assert profile['rows'] == 4
+    assert profile['columns']['SBL']['nulls'] == 1
+
+
+@pytest.mark.skipif(int(pd.__version__.split('.')[0]) >= 3, reason="pandas 3 always copies on write")
+@pytest.mark.parametrize('enabled', [True, False])
+def test_workers_inherit_copy_on_write(drop, tmp_path, enabled):
+    previous = memory_audit.copy_on_write_enabled()
+    memory_audit.enable_copy_on_write(enabled)
+    try:
+        output = str(tmp_path / 'Workers.csv')
+        batch_ingest.run_stage(record_copy_on_write, drop, output, max_workers=2)
+    finally:
+        memory_audit.enable_copy_on_write(previous)
+    assert pd.read_csv(output)['Copy_On_Write'].tolist() == [enabled, enabled]
+
+
+@pytest.mark.parametrize('backend', ['pandas', 'polars'])
+def test_combined_drop_matches_concatenated_file(tmp_path, backend):
+    if backend == 'polars':
+        pytest.importorskip('polars')
+    folder = tmp_path / 'Housing_Violations'
+    folder.mkdir()
+    months = [
+        pd.DataFrame({'Case Number': ['V1', 'V2'], 'Property ID': ['1.1-1-1', '2.2-2-2'], 'Description': [None, None],
+                      'Owner Name': [None, None], 'Units': [1, 2], 'Open Date': ['01/05/2024', '01/09/2024']}),
+        pd.DataFrame({'Case Number': ['V3', 'V4'], 'Property ID': ['3.3-3-3', '4.4-4-4'], 'Description': ['NO HEAT', None],
+                      'Owner Name': ['HALL', None], 'Units': [3.5, None], 'Open Date': ['02/02/2024', None]}),
+    ]
+    for month, frame in zip(['01', '02'], months):
+        frame.to_csv(folder / f'Housing_Violations_2024-{month}.csv', index=False)
+    concatenated = tmp_path / 'Housing_Violations.csv'
+    pd.concat(months).to_csv(concatenated, index=False)
+
+    combined = str(tmp_path / 'Combined.csv')
+    batch_ingest.run_stage(violations_cleaner.process_housing_data, str(folder), combined, max_workers=2, backend=backend)
+    violations_cleaner.process_housing_data(str(concatenated), str(tmp_path / 'Single.csv'), backend=backend)
+
+    with open(combined) as actual, open(tmp_path / 'Single.csv') as expected:
+        assert actual.read() == expected.read()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from etl.housing_court_cases import housing_court_case_cleaner
+from etl.violations import violations_cleaner
+
+
+def read_output(path):
+    # Read every value as written, so an empty cell and 'UNKNOWN' stay distinct
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def test_violations_chunked_output_matches_whole_file(tmp_path):
+    rows = 4000
+    raw = tmp_path / 'Housing_Violations.csv'
+    pd.DataFrame({
+        'Property ID': [f"{i}.1-1-1" for i in range(rows)],
+        'Type': ['Trash (Req_Serv)'] * rows,
+        'Open Date': ['01/05/2020'] * rows,
+        'Closed Date': [None] * (rows // 2) + ['01/08/2020'] * (rows // 2),
+        # Empty in the first chunks, text in the later ones
+        'Description': [None] * (rows // 2) + ['peeling paint'] * (rows // 2),
+        'Latitude': np.where(np.arange(rows) < 1000, np.nan, 42.9),
+    }).to_csv(raw, index=False)
+
+    violations_cleaner.process_housing_data(str(raw), str(tmp_path / 'whole.csv'))
+    violations_cleaner.process_housing_data(str(raw), str(tmp_path / 'chunked.csv'), chunksize=1000)
+
+    whole = read_output(tmp_path / 'whole.csv')
+    pd.testing.assert_frame_equal(read_output(tmp_path / 'chunked.csv'), whole)
+    assert whole['Description'].eq('UNKNOWN').sum() == rows // 2
+
+
+def test_court_cases_chunked_output_matches_whole_file(tmp_path):
+    rows = 3000
+    raw = tmp_path / 'Housing_Court_Cases.csv'
+    pd.DataFrame({
+        'Case Key': range(rows),
+        'Case Add Date': ['12/17/2018'] * rows,
+        'Status': ['OPEN', 'CLOSED'] * (rows // 2),
+        'Resolution': [None] * (rows // 2) + ['DISMISSED'] * (rows // 2),
+        'Resolution Date': [None] * rows,
+        'Address': ['101 ST LOUIS AVE'] * rows,
+        'Contact': [None] * 1000 + ['HALL'] * (rows - 1000),
+        'City': ['Buffalo'] * rows,
+    }).to_csv(raw, index=False)
+
+    housing_court_case_cleaner.process_housing_data(str(raw), str(tmp_path / 'whole.csv'))
+    housing_court_case_cleaner.process_housing_data(str(raw), str(tmp_path / 'chunked.csv'), chunksize=1000)
+
+    pd.testing.assert_frame_equal(read_output(tmp_path / 'chunked.csv'), read_output(tmp_path / 'whole.csv'))
@@ -0,0 +1,35 @@
+import os
+import pandas as pd
+
+from etl.common import batch_ingest
+from etl.common.compressed_io import input_path
+
+
+def write_with_mtime(path, rows, mtime):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+def test_input_path_prefers_newest_variant(tmp_path):
+    plain, compressed = str(tmp_path / 'X.csv'), str(tmp_path / 'X.csv.gz')
+    write_with_mtime(plain, {'Old': [1]}, 1_000_000)
+    write_with_mtime(compressed, {'New': [2]}, 2_000_000)
+    assert input_path(plain) == compressed
+    assert input_path(compressed) == compressed
+
+    os.utime(plain, (3_000_000, 3_000_000))
+    assert input_path(compressed) == plain
+
+
+def test_writing_an_output_removes_stale_variants(tmp_path):
+    raw = str(tmp_path / 'raw.csv')
+    pd.DataFrame({'New': [2]}).to_csv(raw, index=False)
+    stale = tmp_path / 'X.csv'
+    pd.DataFrame({'Old': [1]}).to_csv(stale, index=False)
+    output = str(tmp_path / 'X.csv.gz')
+
+    batch_ingest.run_stage(lambda input_filepath, output_filepath: pd.read_csv(input_filepath).to_csv(output_filepath, index=False),
+                           raw, output)
+    assert not stale.exists()
+    assert input_path(str(stale)) == output
+    assert pd.read_csv(input_path(str(stale))).columns.tolist() == ['New']
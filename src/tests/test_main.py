@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import pytest
+
+import main
+from etl.common import memory_audit
+
+
+@pytest.fixture
+def ran(monkeypatch):
+    """Replaces every stage runner with one that records its name, and leaves copy-on-write as it is."""
+    ran = []
+    for name in main.STAGES:
+        monkeypatch.setitem(main.STAGES, name, lambda name=name: ran.append(name))
+    monkeypatch.setattr(memory_audit, 'enable_copy_on_write', lambda enabled=True: None)
+    return ran
+
+
+def test_select_stages_keeps_pipeline_order():
+    assert main.select_stages() == list(main.STAGES)
+    assert main.select_stages(only=['upload', 'assessment']) == ['assessment', 'upload']
+    assert main.select_stages(start='rollups') == ['rollups', 'property_store', 'upload']
+
+
+def test_only_runs_the_named_stages(ran):
+    main.main(['--only', 'bank', '--only', 'code_violations'])
+    assert ran == ['code_violations', 'bank']
+
+
+def test_from_runs_the_rest_of_the_pipeline(ran):
+    main.main(['--from', 'property_store'])
+    assert ran == ['property_store', 'upload']
+
+
+def test_no_options_run_every_stage(ran):
+    main.main([])
+    assert ran == list(main.STAGES)
+
+
+@pytest.mark.parametrize('argv', [['--only', 'cleaning'], ['--only', 'bank', '--from', 'rollups']])
+def test_invalid_stage_options_are_rejected(ran, argv):
+    with pytest.raises(SystemExit):
+        main.main(argv)
+    assert ran == []
+
+
+def test_importing_main_loads_no_stage_dependencies():
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = "import sys, main; print(sorted({name.split('.')[0] for name in sys.modules} & {'pandas', 'polars', 'snowflake'}))"
+    result = subprocess.run([sys.executable, '-c', script], cwd=src, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
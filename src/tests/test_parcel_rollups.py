@@ -0,0 +1,37 @@
+import pandas as pd
+
+from etl.rollups import parcel_rollups
+
+
+def test_unmatched_keys_are_left_out(tmp_path):
+    pd.DataFrame({'SBL': ['1.1-1-1', 'UNKNOWN', ' 1.1-1-1 ']}).to_csv(tmp_path / 'Code_Violations.csv', index=False)
+    pd.DataFrame({'Print_Key': ['UNKNOWN', '2.2-2-2'], 'Status': ['OPEN', 'Closed']}).to_csv(
+        tmp_path / 'Housing_Court_Cases.csv', index=False)
+    parcel_rollups.build_rollups(str(tmp_path), str(tmp_path / 'state.pkl'))
+
+    parcels = pd.read_csv(tmp_path / 'Parcel_Rollup.csv.gz', index_col='Print_Key')
+    assert parcels.index.tolist() == ['1.1-1-1', '2.2-2-2']
+    assert parcels['Code_Violations'].tolist() == [2, 0]
+    assert parcels['Court_Cases'].tolist() == [0, 1]
+    statuses = pd.read_csv(tmp_path / 'Parcel_Court_Case_Status_Rollup.csv.gz')
+    assert statuses.values.tolist() == [['2.2-2-2', 'CLOSED', 1]]
+
+    # Removing the unmatched rows later leaves the rollups unchanged
+    pd.DataFrame({'SBL': ['1.1-1-1', ' 1.1-1-1 ']}).to_csv(tmp_path / 'Code_Violations.csv', index=False)
+    parcel_rollups.build_rollups(str(tmp_path), str(tmp_path / 'state.pkl'))
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'Parcel_Rollup.csv.gz', index_col='Print_Key'), parcels)
+
+
+def test_changed_contribution_logic_rebuilds(tmp_path, monkeypatch):
+    pd.DataFrame({'SBL': ['1.1-1-1', 'NONE', '2.2-2-2']}).to_csv(tmp_path / 'Code_Violations.csv', index=False)
+    parcel_rollups.build_rollups(str(tmp_path), str(tmp_path / 'state.pkl'))
+    assert 'NONE' in pd.read_csv(tmp_path / 'Parcel_Rollup.csv.gz')['Print_Key'].tolist()
+
+    # The source did not change, but rows keyed 'NONE' no longer count
+    monkeypatch.setattr(parcel_rollups, 'MISSING_PRINT_KEYS', parcel_rollups.MISSING_PRINT_KEYS | {'NONE'})
+    assert parcel_rollups.build_rollups(str(tmp_path), str(tmp_path / 'state.pkl')) == ['Code_Violations']
+    parcels = pd.read_csv(tmp_path / 'Parcel_Rollup.csv.gz')
+    assert parcels['Print_Key'].tolist() == ['1.1-1-1', '2.2-2-2']
+
+    # An unchanged signature keeps the incremental behavior
+    assert parcel_rollups.build_rollups(str(tmp_path), str(tmp_path / 'state.pkl')) == []
@@ -0,0 +1,178 @@
+import gzip
+import pandas as pd
+import pytest
+
+pytest.importorskip('polars')
+
+from etl.assessment import csv_header_transformer, historic_district_name_setter, historic_setter, null_replacer
+from etl.bank import bank_cleaner
+from etl.code_violations import code_violations_cleaner
+from etl.common import polars_backend
+from etl.housing_court_cases import housing_court_case_cleaner
+from etl.local_assessment import local_assessmnet_cleaner
+from etl.violations import violations_cleaner
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def raw_assessment(tmp_path):
+    return write_csv(tmp_path / 'Assessment.csv', {
+        'PRINT_KEY': ['100.34-4-23', '101.1-2-3', '77.5-1-1'],
+        'DeedBook': [11, None, 13],
+        'OwnerOfRecord': ['SMITH', None, 'JONES'],
+        'SaleDate': ['01/05/2020', None, '03/07/2021'],
+        'Col1': [1, 2, 3], 'Col2': ['a', 'b', 'c'], 'Col3': [1.5, None, 2.5], 'Col4': ['x', 'y', 'z'],
+    })
+
+
+@pytest.fixture
+def assessment_header(tmp_path):
+    return write_csv(tmp_path / 'Assessment_header.csv', {
+        'Print_Key': ['100.34-4-23', '101.1-2-3', '77.5-1-1'],
+        'Deed_Book': [11, None, 13],
+        'Owner': ['SMITH', None, 'JONES'],
+        'Sale_Date': ['01/05/2020', None, '03/07/2021'],
+        'Empty_Note': [None, None, None],
+    })
+
+
+@pytest.fixture
+def assessment_cleaned(tmp_path):
+    return write_csv(tmp_path / 'Assessment_cleaned.csv', {
+        'Print_Key': ['100.34-4-23', '101.1-2-3', '77.5-1-1'],
+        'Address': ['12 MAIN ST', '45 FRONT AVE', 'UNKNOWN'],
+        'Deed_Book': [11, -1, 13],
+    })
+
+
+def test_header_stage_parity(raw_assessment):
+    polars_backend.verify_parity(csv_header_transformer.modify_and_export_csv_headers, raw_assessment)
+
+
+def test_null_stage_parity(assessment_header):
+    polars_backend.verify_parity(null_replacer.clean_csv_data, assessment_header)
+
+
+def test_historic_stage_parity(assessment_cleaned, tmp_path):
+    parcels = write_csv(tmp_path / 'All_Historic_Parcels.csv', {'PRINT_KEY': ['101.1-2-3'], 'OTHER': ['x']})
+    polars_backend.verify_parity(historic_setter.load_and_process_assessment_data, assessment_cleaned, parcels)
+
+
+def test_district_name_stage_parity(assessment_cleaned, tmp_path):
+    keys = write_csv(tmp_path / 'Historic_Districts_Print_Keys.csv', {
+        'Print_Key': ['100.34-4-23'], 'Historic_District_Name': ['Allentown'],
+    })
+    polars_backend.verify_parity(historic_district_name_setter.load_and_process_assessment_data, assessment_cleaned, keys)
+
+
+def test_code_violations_parity(tmp_path):
+    raw = write_csv(tmp_path / 'Code_Violations.csv', {
+        'Case Number': ['CV1', 'CV2', 'CV3'],
+        'SBL': ['100.34-4-23', None, '77.5-1-1'],
+        'Prop Class': [210, 220, 230],
+        'Date': ['01/05/2020', '02/06/2020', None],
+        'Violation Location': ['Exterior', None, 'Roof'],
+        'Comments': ['<p>peeling paint. replace siding</p>', None, 'Gutter &amp; downspout'],
+        'Address': ['12 MAIN ST', None, '9 ELM ST'],
+        'Ward': ['A', 'B', 'C'],
+    })
+    polars_backend.verify_parity(code_violations_cleaner.process_code_violations, raw)
+
+
+def test_housing_violations_parity(tmp_path):
+    raw = write_csv(tmp_path / 'Housing_Violations.csv', {
+        'Property ID': ['100.34-4-23', '12345', None, '77.5-1-1'],
+        'Type': ['Trash (Req_Serv)', 'Noise', None, 'Rodents (Req_Serv)'],
+        'Open Date': ['01/05/2020 10:00:00 AM', '01/06/2020 11:00:00 AM', None, '02/01/2021 09:30:00 PM'],
+        'Closed Date': [None, '01/08/2020 10:00:00 AM', None, None],
+        'Description': ['a', None, 'c', None],
+        'City': ['Buffalo'] * 4,
+        'Latitude': [42.9, 42.8, None, 42.7],
+    })
+    polars_backend.verify_parity(violations_cleaner.process_housing_data, raw)
+
+
+@pytest.fixture
+def raw_court_cases(tmp_path):
+    return write_csv(tmp_path / 'Housing_Court_Cases.csv', {
+        'Case Key': [1, 2, 3],
+        'Case Add Date': ['12/17/2018', '12/12/2018', None],
+        'Case Number': ['CRT18-1', 'CRT18-2', 'CRT18-3'],
+        'Status': ['OPEN', 'CLOSED', 'OPEN'],
+        'Last Action': ['03/22/2021', None, '01/01/2020'],
+        'Resolution': [None, 'DISMISSED', None],
+        'Resolution Date': [None, '07/31/2019', None],
+        'Address': ['101 ST LOUIS AVE', None, '676 RILEY'],
+        'Contact': ['HALL', 'GATES', None],
+        'City': ['Buffalo'] * 3,
+        'Zipcode': [14202, 14208, None],
+    })
+
+
+def test_housing_court_cases_parity(raw_court_cases):
+    polars_backend.verify_parity(housing_court_case_cleaner.process_housing_data, raw_court_cases)
+
+
+def test_local_assessment_parity(tmp_path):
+    raw = write_csv(tmp_path / 'Local_Assessment.csv', {
+        'PrintKeyCode': ['100.34-4-23', '101.1-2-3', '77.5-1-1'],
+        'RollYear': [2023, 2023, 2022],
+        'Bank': ['001', None, '002'],
+        'FullMarketValue': [100000, None, 90000],
+        'CountyTaxableValue': [90000, 80000, None],
+        'SchoolTaxable': [None, 70000, 60000],
+        'Extra': ['a', 'b', 'c'],
+    })
+    assessment = write_csv(tmp_path / 'Assessment.csv', {
+        'Print_Key': ['100.34-4-23', '101.1-2-3', '77.5-1-1', '5.1-1-1'],
+        'Address': ['12 MAIN ST', '45 FRONT AVE', '9 ELM ST', '1 OAK ST'],
+    })
+    polars_backend.verify_parity(local_assessmnet_cleaner.process_assessment_data, raw, assessment)
+
+
+def test_bank_codes_parity(tmp_path):
+    raw = write_csv(tmp_path / 'Bank_Code_Identifier.csv', {
+        'Bank Code': ['001', '002', '003'],
+        'Bank Name': ['First Bank', None, 'Third Bank'],
+        'Notes': [None, None, 'merged'],
+    })
+    polars_backend.verify_parity(bank_cleaner.load_and_process_data, raw)
+
+
+def test_polars_gzip_round_trip(raw_court_cases, tmp_path):
+    plain_output = str(tmp_path / 'plain.csv')
+    gzip_output = str(tmp_path / 'compressed.csv.gz')
+    polars_backend.process_housing_court_cases(raw_court_cases, plain_output)
+    polars_backend.process_housing_court_cases(raw_court_cases, gzip_output)
+    with gzip.open(gzip_output, 'rt', newline='') as file:
+        assert file.read() == open(plain_output, newline='').read()
+
+    # A compressed stage file is also read back correctly as the next stage's input
+    relinked_output = str(tmp_path / 'relinked.csv.gz')
+    polars_backend.process_housing_court_cases(gzip_output, relinked_output)
+    pd.testing.assert_frame_equal(pd.read_csv(relinked_output), pd.read_csv(plain_output))
+
+
+def test_decompressed_inputs_are_removed_after_the_sink(assessment_cleaned, tmp_path, monkeypatch):
+    scratch = tmp_path / 'scratch'
+    scratch.mkdir()
+    monkeypatch.setattr(polars_backend.tempfile, 'tempdir', str(scratch))
+    assessment = tmp_path / 'Assessment_cleaned.csv.gz'
+    parcels = tmp_path / 'All_Historic_Parcels.csv.gz'
+    with open(assessment_cleaned, 'rb') as source, gzip.open(assessment, 'wb') as target:
+        target.write(source.read())
+    with gzip.open(parcels, 'wt', newline='') as file:
+        file.write('PRINT_KEY,OTHER\n101.1-2-3,x\n')
+
+    output = str(tmp_path / 'Assessment_historic.csv')
+    polars_backend.process_assessment_historic(str(assessment), str(parcels), output)
+    assert pd.read_csv(output)['Historic_Property'].tolist() == [0, 1, 0]
+    assert list(scratch.iterdir()) == []
+
+def test_unknown_backend_is_rejected(raw_court_cases, tmp_path):
+    with pytest.raises(ValueError, match='Unsupported backend'):
+        housing_court_case_cleaner.process_housing_data(raw_court_cases, str(tmp_path / 'out.csv'), backend='spark')
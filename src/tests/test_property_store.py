@@ -0,0 +1,49 @@
+import os
+import pandas as pd
+
+from etl.property_lookup import property_store
+
+
+def write_prod_files(prod_dir):
+    pd.DataFrame({'Print_Key': ['100.34-4-23', '101.1-2-3'], 'Owner': ['SMITH', 'JONES'],
+                  'Historic_Property': ['1', '0'], 'Historic_District_Name': ['ALLENTOWN', 'UNKNOWN']}).to_csv(
+        prod_dir / 'Assessment.csv', index=False)
+    pd.DataFrame({'Print_Key': [' 100.34-4-23', '101.1-2-3'], 'Case_Number': ['V1', 'V2']}).to_csv(
+        prod_dir / 'Housing_Violations.csv', index=False)
+    pd.DataFrame({'SBL': ['100.34-4-23 '], 'Comments': ['PEELING PAINT']}).to_csv(prod_dir / 'Code_Violations.csv', index=False)
+
+
+def test_lookup_matches_keys_in_any_spacing_or_case(tmp_path):
+    write_prod_files(tmp_path)
+    store = str(tmp_path / 'Property_Lookup.db')
+    property_store.build_property_store(str(tmp_path), store)
+
+    parcel = property_store.lookup_parcel(' 100.34 -4-23', store)
+    assert parcel['print_key'] == '100.34-4-23'
+    assert [row['Owner'] for row in parcel['assessment']] == ['SMITH']
+    assert parcel['historic'] == [{'Historic_Property': '1', 'Historic_District_Name': 'ALLENTOWN'}]
+    assert [row['Case_Number'] for row in parcel['housing_violations']] == ['V1']
+    assert [row['Comments'] for row in parcel['code_violations']] == ['PEELING PAINT']
+    assert parcel['local_assessment'] == [] and parcel['bank'] == []
+
+
+def test_unchanged_files_are_not_reloaded(tmp_path):
+    write_prod_files(tmp_path)
+    store = str(tmp_path / 'Property_Lookup.db')
+    assert property_store.build_property_store(str(tmp_path), store) == ['Assessment', 'Housing_Violations', 'Code_Violations']
+    assert property_store.build_property_store(str(tmp_path), store) == []
+
+
+def test_changed_files_are_reloaded(tmp_path):
+    write_prod_files(tmp_path)
+    store = str(tmp_path / 'Property_Lookup.db')
+    property_store.build_property_store(str(tmp_path), store)
+
+    # A newer compressed variant replaces the stale plain file as the source
+    pd.DataFrame({'SBL': ['101.1-2-3'], 'Comments': ['BROKEN WINDOW']}).to_csv(tmp_path / 'Code_Violations.csv.gz', index=False)
+    stat = os.stat(tmp_path / 'Code_Violations.csv')
+    os.utime(tmp_path / 'Code_Violations.csv.gz', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert property_store.build_property_store(str(tmp_path), store) == ['Code_Violations']
+
+    assert property_store.lookup_parcel('100.34-4-23', store)['code_violations'] == []
+    assert [row['Comments'] for row in property_store.lookup_parcel('101.1-2-3', store)['code_violations']] == ['BROKEN WINDOW']
@@ -0,0 +1,65 @@
+import json
+import pandas as pd
+import pytest
+
+from etl.assessment import csv_header_transformer, null_replacer
+from etl.common.data_profiler import profile_path
+from etl.housing_court_cases import address_matcher, housing_court_case_cleaner
+
+
+def read_profile(output_filepath):
+    with open(profile_path(output_filepath)) as file:
+        return json.load(file)
+
+
+def test_replace_nulls_keeps_blank_text(tmp_path):
+    df = pd.DataFrame({'Owner': ['SMITH', None], 'Deed_Book': [11, None]})
+    result = null_replacer.replace_nulls(df)
+    assert result['Owner'].isna().tolist() == [False, True]
+    assert result['Deed_Book'].tolist() == [11, -1]
+
+
+def test_header_stage_is_profiled(tmp_path):
+    raw = tmp_path / 'Assessment.csv'
+    pd.DataFrame({'PRINT_KEY': ['1.1-1-1', '2.2-2-2'], 'DeedBook': [11, None],
+                  'A': [1, 2], 'B': [1, 2], 'C': [1, 2], 'D': [1, 2]}).to_csv(raw, index=False)
+    output = str(tmp_path / 'Assessment_header.csv.gz')
+    csv_header_transformer.modify_and_export_csv_headers(str(raw), output)
+    profile = read_profile(output)
+    assert profile['rows'] == 2
+    assert profile['columns']['Deed_Book']['nulls'] == 1
+
+
+def test_parcel_linking_is_profiled(tmp_path):
+    court = tmp_path / 'Housing_Court_Cases.csv'
+    assessment = tmp_path / 'Assessment.csv'
+    pd.DataFrame({'Case_Number': ['CRT1', 'CRT2'], 'Address': ['12 MAIN ST', '9 NOWHERE RD']}).to_csv(court, index=False)
+    pd.DataFrame({'Print_Key': ['1.1-1-1'], 'Address': ['12 MAIN ST']}).to_csv(assessment, index=False)
+    address_matcher.link_court_cases_to_parcels(str(court), str(assessment), str(court))
+    profile = read_profile(str(court))
+    assert profile['columns']['Print_Key']['sentinels'] == 1
+
+
+def test_polars_outputs_are_profiled(tmp_path):
+    polars_backend = pytest.importorskip('etl.common.polars_backend')
+    raw = tmp_path / 'Bank_Code_Identifier.csv'
+    pd.DataFrame({'Bank Code': ['001', '002'], 'Bank Name': ['First Bank', None]}).to_csv(raw, index=False)
+    output = str(tmp_path / 'Bank_Code_Identifier_cleaned.csv.gz')
+    polars_backend.process_bank_codes(str(raw), output)
+    assert read_profile(output)['rows'] == 2
+
+
+def test_polars_profile_matches_pandas_profile(tmp_path):
+    polars_backend = pytest.importorskip('etl.common.polars_backend')
+    raw = tmp_path / 'Housing_Court_Cases.csv'
+    pd.DataFrame({
+        'Case Key': range(6), 'Case Add Date': ['12/17/2018', None] * 3, 'Status': ['OPEN', 'CLOSED', 'OPEN'] * 2,
+        'Resolution': [None, 'DISMISSED'] * 3, 'Address': ['12 MAIN ST'] * 6, 'Contact': ['HALL', None] * 3,
+    }).to_csv(raw, index=False)
+    housing_court_case_cleaner.process_housing_data(str(raw), str(tmp_path / 'pandas.csv'))
+    polars_backend.process_housing_court_cases(str(raw), str(tmp_path / 'polars.csv.gz'))
+
+    expected, actual = read_profile(str(tmp_path / 'pandas.csv')), read_profile(str(tmp_path / 'polars.csv.gz'))
+    assert actual['rows'] == expected['rows']
+    for name, column in expected['columns'].items():
+        assert actual['columns'][name] == column, name
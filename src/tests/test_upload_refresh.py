@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip('snowflake.connector')
+
+import watch
+from etl.data_upload import data_upload
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement):
+        self.statements.append(' '.join(statement.split()))
+
+    def close(self):
+        pass
+
+
+def upload(tmp_path, monkeypatch, tables):
+    connection = RecordingConnection()
+    monkeypatch.setattr(data_upload, 'connect', lambda: connection)
+    monkeypatch.setattr(data_upload, 'DATA_DIRECTORIES', {'prod': str(tmp_path)})
+    data_upload.run_data_upload_pipeline(tables)
+    return connection.statements
+
+
+def test_upload_replaces_table_contents(tmp_path, monkeypatch):
+    pd.DataFrame({'Print_Key': ['1.1-1-1'], 'Court_Cases': [2]}).to_csv(tmp_path / 'Parcel_Rollup.csv.gz', index=False)
+    statements = upload(tmp_path, monkeypatch, {'prod': {'Parcel_Rollup'}})
+
+    put = next(statement for statement in statements if statement.startswith('PUT'))
+    assert 'OVERWRITE=TRUE' in put
+    create = statements.index('CREATE OR REPLACE TABLE Parcel_Rollup ("Print_Key" VARCHAR, "Court_Cases" VARCHAR);')
+    copy = next(i for i, statement in enumerate(statements) if statement.startswith('COPY INTO Parcel_Rollup'))
+    assert create < copy
+    assert not any(statement.startswith('TRUNCATE') for statement in statements)
+
+
+def test_upload_follows_header_changes(tmp_path, monkeypatch):
+    court_cases = tmp_path / 'Housing_Court_Cases.csv.gz'
+    pd.DataFrame({'Case_Number': ['CRT1'], 'Address': ['12 MAIN ST']}).to_csv(court_cases, index=False)
+    upload(tmp_path, monkeypatch, {'prod': {'Housing_Court_Cases'}})
+
+    pd.DataFrame({'Case_Number': ['CRT1'], 'Address': ['12 MAIN ST'], 'Print_Key': ['1.1-1-1'],
+                  'Match_Confidence': [1.0]}).to_csv(court_cases, index=False)
+    statements = upload(tmp_path, monkeypatch, {'prod': {'Housing_Court_Cases'}})
+    assert ('CREATE OR REPLACE TABLE Housing_Court_Cases ("Case_Number" VARCHAR, "Address" VARCHAR, '
+            '"Print_Key" VARCHAR, "Match_Confidence" VARCHAR);') in statements
+
+
+def test_watch_retries_failed_changes(monkeypatch):
+    snapshots = iter([{}, {('Code_Violations', 'a.csv'): (1, 1)}] + [{('Code_Violations', 'a.csv'): (1, 1)}] * 3)
+    attempts = []
+
+    def run_affected(changed_tables, upload):
+        attempts.append(set(changed_tables))
+        if len(attempts) == 1:
+            raise RuntimeError('warehouse unavailable')
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch, 'snapshot', lambda raw_dir: next(snapshots))
+    monkeypatch.setattr(watch, 'run_affected', run_affected)
+    monkeypatch.setattr(watch.time, 'sleep', lambda seconds: None)
+    with pytest.raises(KeyboardInterrupt):
+        watch.watch('raw', poll_interval=0, debounce=0)
+    assert attempts == [{'Code_Violations'}, {'Code_Violations'}]
@@ -0,0 +1,148 @@
+import argparse
+import os
+import time
+import main
+from etl.common.compressed_io import strip_compression_suffix
+from etl.common.config import RAW_FILE_PATH
+
+# Stage name -> (runner, raw files it reads, upstream stages it reads from, tables it writes per schema)
+STAGES = {
+    'assessment': (
+        main.run_assessment_cleaner,
+        {'Assessment', 'All_Historic_Parcels', 'Historic_Districts_Print_Keys'},
+        set(),
+        {'stage': {'Assessment_header', 'Assessment_cleaned', 'Assessment_is_Historic'}, 'prod': {'Assessment'}},
+    ),
+    'code_violations': (main.run_code_violations_cleaner, {'Code_Violations'}, set(), {'prod': {'Code_Violations'}}),
+    'violations': (main.run_violations_cleaner, {'Housing_Violations'}, set(), {'prod': {'Housing_Violations'}}),
+    'housing_court_cases': (
+        main.run_housing_court_case_cleaner, {'Housing_Court_Cases'}, {'assessment'}, {'prod': {'Housing_Court_Cases'}},
+    ),
+    'local_assessment': (
+        main.run_local_assessment_cleaner, {'Local_Assessment'}, {'assessment'}, {'prod': {'Assessment_with_Local'}},
+    ),
+    'bank': (main.run_bank_data_cleaning, {'Bank_Code_Identifier'}, set(), {'prod': {'Bank_Code_Identifier'}}),
+    'rollups': (
+        main.run_rollup_build, set(), {'assessment', 'code_violations', 'violations', 'housing_court_cases'},
+        {'prod': {'Parcel_Rollup', 'Parcel_Court_Case_Status_Rollup',
+                  'Historic_District_Rollup', 'Historic_District_Court_Case_Status_Rollup'}},
+    ),
+}
+
+
+def affected_stages(changed_tables):
+    """
+    Returns the stages to re-run, in pipeline order, for a set of changed raw tables.
+
+    Parameters:
+    - changed_tables (set): Raw file names without extension, e.g. {'Local_Assessment'}.
+
+    Returns:
+    - list: Stage names whose raw inputs changed, plus every stage downstream of them.
+    """
+    affected = []
+    for name, (_, raw_inputs, upstream, _) in STAGES.items():
+        if raw_inputs & changed_tables or upstream & set(affected):
+            affected.append(name)
+    return affected
+
+
+def tables_to_upload(changed_tables, stages):
+    """Collects the raw tables that changed and the stage/prod tables the re-run stages wrote."""
+    tables = {'raw': set(changed_tables)}
+    for name in stages:
+        for schema, schema_tables in STAGES[name][3].items():
+            tables.setdefault(schema, set()).update(schema_tables)
+    return tables
+
+
+def raw_table(name):
+    """
+    Maps a raw file or folder name to the raw table it feeds, so multi-file drops such as
+    'Code_Violations_2024-01.csv' or a 'Code_Violations/' folder count as 'Code_Violations'.
+    """
+    for _, raw_inputs, _, _ in STAGES.values():
+        for table in raw_inputs:
+            if name == table or name.startswith(table + '_'):
+                return table
+    return name
+
+
+def snapshot(raw_dir):
+    """Returns {(table name, path): (size, mtime)} for the CSV files in the raw folder and its drop folders."""
+    files = {}
+    for root, _, filenames in os.walk(raw_dir):
+        for filename in filenames:
+            base = strip_compression_suffix(filename)
+            if not base.endswith('.csv'):
+                continue
+            path = os.path.join(root, filename)
+            name = os.path.relpath(root, raw_dir).split(os.sep)[0] if root != raw_dir else os.path.splitext(base)[0]
+            stat = os.stat(path)
+            files[(raw_table(name), path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def run_affected(changed_tables, upload=True):
+    """Re-runs the stages downstream of the changed raw files and uploads only their tables."""
+    stages = affected_stages(changed_tables)
+    print(f"Raw files changed: {sorted(changed_tables)}. Re-running stages: {stages or 'none'}")
+    for name in stages:
+        STAGES[name][0]()
+    if stages:
+        main.run_property_store_build()
+    if upload:
+        from etl.data_upload import data_upload
+        data_upload.run_data_upload_pipeline(tables_to_upload(changed_tables, stages))
+
+
+def watch(raw_dir=RAW_FILE_PATH, poll_interval=5.0, debounce=30.0, upload=True):
+    """
+    Watches the raw folder and re-runs the affected stages when files are added or replaced.
+
+    Changes are debounced: stages run once no raw file has changed for `debounce` seconds,
+    so a file still being copied, or several files landing together, trigger a single run.
+    A failed run is retried after the next quiet period, together with any newer changes.
+
+    Parameters:
+    - raw_dir (str): Folder containing the raw CSV files.
+    - poll_interval (float): Seconds between checks of the folder.
+    - debounce (float): Seconds the folder must be quiet before stages run.
+    - upload (bool): Upload the affected tables to Snowflake after re-running.
+    """
+    from etl.common.memory_audit import enable_copy_on_write
+    enable_copy_on_write()
+    print(f"Watching {raw_dir} for changes (poll {poll_interval}s, debounce {debounce}s)...")
+    previous = snapshot(raw_dir)
+    pending = set()
+    last_change = None
+    while True:
+        time.sleep(poll_interval)
+        current = snapshot(raw_dir)
+        changed = {
+            table for (table, path), signature in current.items() if previous.get((table, path)) != signature
+        }
+        previous = current
+        if changed:
+            pending |= changed
+            last_change = time.monotonic()
+            continue
+        if pending and time.monotonic() - last_change >= debounce:
+            try:
+                run_affected(pending, upload)
+            except Exception as error:
+                # Keep the changes pending and retry them after another quiet period
+                print(f"Re-run for {sorted(pending)} failed: {error}. Retrying in {debounce}s.")
+                last_change = time.monotonic()
+                continue
+            pending = set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run only the pipeline stages affected by new raw files.")
+    parser.add_argument('--raw-dir', default=RAW_FILE_PATH, help="Folder containing the raw CSV files.")
+    parser.add_argument('--poll', type=float, default=5.0, help="Seconds between checks of the raw folder.")
+    parser.add_argument('--debounce', type=float, default=30.0, help="Seconds of quiet before stages run.")
+    parser.add_argument('--no-upload', action='store_true', help="Skip the Snowflake upload after re-running.")
+    args = parser.parse_args()
+    watch(args.raw_dir, args.poll, args.debounce, not args.no_upload)